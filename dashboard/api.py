@@ -0,0 +1,170 @@
+from flask import Blueprint, Flask, Response, jsonify, request
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+
+from dashboard.backends import Filters
+
+# Seconds clients may reuse a response before revalidating with If-None-Match
+API_CACHE_MAX_AGE = 60
+# Serialized responses kept in memory, keyed by ETag
+API_CACHE_SIZE = 256
+
+
+def _records(df):
+    """DataFrame -> list of dicts with plain JSON types (NaN -> null, dates -> ISO)."""
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _filters_from_args():
+    """Read the optional buyer/year/start/end/supplier query parameters."""
+    buyer = request.args.get("buyer") or None
+    year = request.args.get("year") or None
+    if year is not None:
+        year = int(year)
+    start = request.args.get("start") or None
+    end = request.args.get("end") or None
+    supplier = request.args.get("supplier") or None
+    return Filters(buyer, year, start, end, supplier)
+
+
+def _top_n_from_args(default=10):
+    """Read the `n` query parameter for top-n endpoints (must be >= 1)."""
+    n = int(request.args.get("n", default))
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    return n
+
+
+def register_api_routes(server: Flask, store):
+    """Mount the read-only JSON aggregates API (/api/...) on the Flask server."""
+
+    api = Blueprint("api", __name__, url_prefix="/api")
+    cache = OrderedDict()
+    cache_lock = threading.Lock()
+
+    def version():
+        return store.version
+
+    def backend():
+        return store.backend
+
+    def cached_json(compute):
+        """
+        Serve compute() as JSON with an ETag derived from the dataset version,
+        path and query string. Matching If-None-Match gets a 304 and
+        compute() is never called.
+        """
+        if not store.ready:
+            response = jsonify({"status": "failed" if store.failed else "warming_up"})
+            response.status_code = 503
+            response.headers["Retry-After"] = "5"
+            return response
+
+        params = sorted(request.args.items(multi=True))
+        etag = hashlib.sha1(f"{version()}|{request.path}|{params}".encode()).hexdigest()
+
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            with cache_lock:
+                body = cache.get(etag)
+                if body is not None:
+                    cache.move_to_end(etag)
+            if body is None:
+                body = json.dumps(compute())
+                with cache_lock:
+                    cache[etag] = body
+                    while len(cache) > API_CACHE_SIZE:
+                        cache.popitem(last=False)
+            response = Response(body, mimetype="application/json")
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = f"public, max-age={API_CACHE_MAX_AGE}"
+        return response
+
+    @api.errorhandler(ValueError)
+    def bad_request(e):
+        return jsonify({"error": f"Invalid query parameter: {e}"}), 400
+
+    @api.route("/version")
+    def get_version():
+        return cached_json(lambda: {"dataset_version": version(), "rows": backend().count()})
+
+    @api.route("/aggregates/by-year")
+    def get_by_year():
+        return cached_json(lambda: {
+            "dataset_version": version(),
+            "data": _records(backend().value_by_year(_filters_from_args())),
+        })
+
+    @api.route("/aggregates/top-buyers")
+    def get_top_buyers():
+        return cached_json(lambda: {
+            "dataset_version": version(),
+            "data": _records(backend().top_buyers(_filters_from_args(), _top_n_from_args())),
+        })
+
+    @api.route("/aggregates/top-suppliers")
+    def get_top_suppliers():
+        return cached_json(lambda: {
+            "dataset_version": version(),
+            "data": _records(backend().top_suppliers(_filters_from_args(), _top_n_from_args())),
+        })
+
+    @api.route("/aggregates/procurement-methods")
+    def get_procurement_methods():
+        return cached_json(lambda: {
+            "dataset_version": version(),
+            "data": _records(backend().procurement_method_counts(_filters_from_args())),
+        })
+
+    @api.route("/aggregates/by-cluster")
+    def get_by_cluster():
+        def compute():
+            filters = _filters_from_args()
+            return {
+                "dataset_version": version(),
+                "anomalies": _records(backend().anomalies_by_cluster(filters)),
+                "distribution": _records(backend().cluster_distribution(filters)),
+            }
+
+        return cached_json(compute)
+
+    @api.route("/aggregates/timeseries")
+    def get_timeseries():
+        def compute():
+            from dashboard.utils.time_index import ROLLUP_FREQS
+
+            freq = request.args.get("freq", "M")
+            if freq not in ROLLUP_FREQS:
+                raise ValueError(f"freq must be one of {list(ROLLUP_FREQS)}")
+            rollup = backend().rollup(freq, _filters_from_args())
+            return {"dataset_version": version(), "freq": freq, "data": _records(rollup)}
+
+        return cached_json(compute)
+
+    @api.route("/benford")
+    def get_benford():
+        column = request.args.get("column") or "total_value_kes"
+
+        def compute():
+            # Deferred: pulls in matplotlib and scipy
+            from dashboard.utils.benford_utils import (
+                BENFORD_MAX_RESAMPLES, BENFORD_RESAMPLES, benford_summary_from_counts,
+            )
+            resamples = int(request.args.get("resamples", BENFORD_RESAMPLES))
+            if not 1 <= resamples <= BENFORD_MAX_RESAMPLES:
+                raise ValueError(f"resamples must be between 1 and {BENFORD_MAX_RESAMPLES}")
+            if column not in backend().columns():
+                summary = None
+            else:
+                counts = backend().leading_digit_counts(column, _filters_from_args())
+                summary = benford_summary_from_counts(counts, column, resamples)
+            return {"dataset_version": version(), "summary": summary}
+
+        return cached_json(compute)
+
+    server.register_blueprint(api)
+    print("🔌 [API] JSON aggregates API mounted at /api")
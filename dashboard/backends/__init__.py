@@ -0,0 +1,28 @@
+import importlib.util
+import os
+
+from dashboard.backends.base import DataBackend, Filters, NO_FILTERS
+
+# Select with DASHBOARD_BACKEND=pandas|duckdb (default: pandas)
+BACKEND_ENV = "DASHBOARD_BACKEND"
+BACKENDS = ("pandas", "duckdb")
+
+
+def selected_backend() -> str:
+    """Backend requested through the environment, falling back to pandas."""
+    name = os.environ.get(BACKEND_ENV, "pandas").strip().lower()
+    if name not in BACKENDS:
+        print(f"[⚠] Unknown {BACKEND_ENV}={name!r}; expected one of {BACKENDS}. Using pandas.")
+        return "pandas"
+    # find_spec checks for duckdb without importing it on the startup path
+    if name == "duckdb" and importlib.util.find_spec("duckdb") is None:
+        print(
+            f"[⚠] {BACKEND_ENV}=duckdb but the 'duckdb' package is not installed."
+            "\n    Install it with: pip install duckdb"
+            "\n    Falling back to the pandas backend."
+        )
+        return "pandas"
+    return name
+
+
+__all__ = ["DataBackend", "Filters", "NO_FILTERS", "BACKEND_ENV", "BACKENDS", "selected_backend"]
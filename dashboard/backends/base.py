@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional
+
+
+class Filters(NamedTuple):
+    """The dashboard filter inputs; every field is optional."""
+    buyer: Optional[str] = None
+    year: Optional[int] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    supplier: Optional[str] = None
+
+
+NO_FILTERS = Filters()
+
+
+class DataBackend(ABC):
+    """
+    Query interface the callbacks, layouts and API use instead of touching
+    merged_df directly. Aggregations return small pandas DataFrames shaped
+    like the helpers in dashboard.utils.aggregates, so figure code doesn't
+    care where the data lives.
+    """
+
+    name = "base"
+
+    # --- Metadata ---
+
+    @abstractmethod
+    def columns(self) -> list:
+        """All column names."""
+
+    @abstractmethod
+    def numeric_columns(self) -> list:
+        """Numeric column names (candidates for Benford analysis)."""
+
+    @abstractmethod
+    def distinct(self, column: str) -> list:
+        """Sorted distinct non-null values of `column`."""
+
+    @abstractmethod
+    def supplier_options(self, min_contracts: int = 1):
+        """supplier_id, supplier_name, contracts for suppliers with >= min_contracts, by name."""
+
+    @abstractmethod
+    def summary(self) -> dict:
+        """Headline numbers: contracts, total_value_kes, anomaly_rate, avg_duration_days."""
+
+    @abstractmethod
+    def date_bounds(self):
+        """(min, max) contract start date, or (None, None)."""
+
+    # --- Filtered queries ---
+
+    @abstractmethod
+    def count(self, filters: Filters = NO_FILTERS, column_filters=None) -> int:
+        """Number of contracts matching `filters` and `column_filters` (see rows())."""
+
+    @abstractmethod
+    def value_by_year(self, filters: Filters = NO_FILTERS):
+        """year, total_value_kes"""
+
+    @abstractmethod
+    def top_buyers(self, filters: Filters = NO_FILTERS, n: int = 10):
+        """buyer_name, total_value_kes — top-n by value."""
+
+    @abstractmethod
+    def top_suppliers(self, filters: Filters = NO_FILTERS, n: int = 10):
+        """supplier_id, supplier_name, total_value_kes, contracts — top-n by value."""
+
+    @abstractmethod
+    def procurement_method_counts(self, filters: Filters = NO_FILTERS):
+        """tender_procurementmethod, count"""
+
+    @abstractmethod
+    def anomalies_by_cluster(self, filters: Filters = NO_FILTERS):
+        """cluster, is_anomaly (number of anomalies)"""
+
+    @abstractmethod
+    def cluster_distribution(self, filters: Filters = NO_FILTERS):
+        """cluster, count"""
+
+    @abstractmethod
+    def rollup(self, freq: str, filters: Filters = NO_FILTERS):
+        """period, total_value_kes, contracts, anomalies per month ("M") or quarter ("Q")."""
+
+    @abstractmethod
+    def split_contracts(self, filters: Filters = NO_FILTERS, limit: int = 500, columns=None):
+        """(summary dict, first `limit` flagged rows ordered by cluster and date, only `columns` if given)."""
+
+    @abstractmethod
+    def leading_digit_counts(self, column: str, filters: Filters = NO_FILTERS):
+        """Counts of leading digits 1-9 of `column` (numpy array of length 9)."""
+
+    @abstractmethod
+    def rows(self, filters: Filters = NO_FILTERS, columns=None, offset: int = 0,
+             limit: int = 200, sort_by=None, require_numeric=None, column_filters=None):
+        """
+        One page of contract rows. `sort_by` is a list of (column, ascending)
+        pairs; without it rows keep their natural order. Rows whose
+        `require_numeric` columns are missing or not numbers are skipped.
+        `column_filters` is a list of table_filter.Conditions from the table's
+        filter row; conditions on unknown columns are ignored.
+        """
+
+    @abstractmethod
+    def sample_rows(self, filters: Filters = NO_FILTERS, columns=None, n: int = 20_000):
+        """Up to `n` rows, sampled reproducibly when more match (for scatter plots)."""
@@ -0,0 +1,359 @@
+import os
+import tempfile
+import threading
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from dashboard.backends.base import DataBackend, Filters, NO_FILTERS
+from dashboard.utils.time_index import day_bounds
+
+# Prepared merged_df is cached here as Parquet, one file per dataset version
+PARQUET_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache"
+)
+# Bump when the warm-up pipeline changes the derived columns, so stale Parquet is rebuilt
+PIPELINE_VERSION = 4
+# Optional cap on DuckDB worker threads (default: all cores)
+THREADS_ENV = "DASHBOARD_DUCKDB_THREADS"
+
+_DATE_TRUNC = {"M": "month", "Q": "quarter"}
+_COMPARE_OPS = ("=", "!=", "<", "<=", ">", ">=")
+_ANOMALY_INT = "CAST(COALESCE(TRY_CAST(is_anomaly AS BOOLEAN), false) AS INTEGER)"
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _ident(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def parquet_path(dataset_version: str) -> str:
+    """Cache file for a dataset version under the current pipeline version."""
+    return os.path.join(PARQUET_CACHE_DIR, f"merged_{dataset_version}_p{PIPELINE_VERSION}.parquet")
+
+
+def write_parquet(df: pd.DataFrame, path: str):
+    """
+    Write the prepared frame to Parquet (atomically). The temp file name is
+    unique per writer, since the debug reloader warms up in two processes.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".parquet.tmp")
+    os.close(fd)
+    con = duckdb.connect()
+    try:
+        con.register("merged_df", df)
+        con.execute(f"COPY merged_df TO {_sql_string(tmp)} (FORMAT PARQUET)")
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    finally:
+        con.close()
+
+
+class DuckDBBackend(DataBackend):
+    """
+    Embedded DuckDB over the Parquet copy of merged_df.
+    Filters, group-bys, top-N and table paging are pushed down into SQL, so
+    queries run multi-threaded and only the (small) results reach pandas;
+    DuckDB spills to disk when an aggregation doesn't fit in memory.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, path: str, version: str, threads=None):
+        self.path = path
+        self.version = version
+        self._con = duckdb.connect(database=":memory:")
+        threads = threads or os.environ.get(THREADS_ENV)
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        spill_dir = os.path.join(PARQUET_CACHE_DIR, "duckdb_tmp")
+        self._con.execute(f"SET temp_directory = {_sql_string(spill_dir)}")
+        self._con.execute(
+            f"CREATE VIEW contracts AS SELECT * FROM read_parquet({_sql_string(path)})"
+        )
+        self._types = {
+            name: dtype for name, dtype, *_ in self._con.execute("DESCRIBE contracts").fetchall()
+        }
+        self._local = threading.local()
+
+    # --- Helpers ---
+
+    def _cursor(self):
+        """DuckDB connections aren't shared across threads; each thread gets a cursor."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self._con.cursor()
+        return cursor
+
+    def _query(self, sql: str, params=()) -> pd.DataFrame:
+        return self._cursor().execute(sql, list(params)).df()
+
+    def _has(self, *columns) -> bool:
+        return all(c in self._types for c in columns)
+
+    def _where(self, filters: Filters, *conditions):
+        """WHERE clause and parameters for the dashboard filters plus extra conditions."""
+        clauses, params = list(conditions), []
+        if filters.buyer:
+            clauses.append("buyer_name = ?")
+            params.append(filters.buyer)
+        if filters.year:
+            clauses.append("year = ?")
+            params.append(filters.year)
+        if (filters.start_date or filters.end_date) and self._has("contract_start_date"):
+            lo, hi = day_bounds(filters.start_date, filters.end_date)
+            if lo is not None:
+                clauses.append("contract_start_date >= ?")
+                params.append(lo.to_pydatetime())
+            if hi is not None:
+                clauses.append("contract_start_date < ?")
+                params.append(hi.to_pydatetime())
+        if filters.supplier and self._has("supplier_id"):
+            clauses.append("supplier_id = ?")
+            params.append(filters.supplier)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def _column_conditions(self, conditions):
+        """
+        SQL conditions and parameters for table_filter.Conditions (same rules as
+        the pandas mask). _where() puts extra conditions first, so these
+        parameters go before its own.
+        """
+        clauses, params = [], []
+        for cond in conditions or []:
+            if not self._has(cond.column):
+                continue
+            col = _ident(cond.column)
+            text = f"CAST({col} AS VARCHAR)"
+            if cond.op in ("is blank", "is not blank"):
+                blank = f"({col} IS NULL OR {text} = '')"
+                clauses.append(blank if cond.op == "is blank" else f"NOT {blank}")
+                continue
+            if cond.op in _COMPARE_OPS and not isinstance(cond.value, str):
+                clauses.append(f"TRY_CAST({col} AS DOUBLE) {cond.op} ?")
+                params.append(float(cond.value))
+                continue
+            value = str(cond.value)
+            if not cond.case_sensitive:
+                text, value = f"lower({text})", value.lower()
+            if cond.op == "contains":
+                clauses.append(f"contains({text}, ?)")
+            elif cond.op == "datestartswith":
+                clauses.append(f"starts_with({text}, ?)")
+            elif cond.op in _COMPARE_OPS:
+                clauses.append(f"{text} {cond.op} ?")
+            else:
+                continue
+            params.append(value)
+        return clauses, params
+
+    # --- Metadata ---
+
+    def columns(self):
+        return list(self._types)
+
+    def numeric_columns(self):
+        numeric = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "FLOAT", "DOUBLE", "DECIMAL",
+                   "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT")
+        return [c for c, t in self._types.items() if t.startswith(numeric)]
+
+    def distinct(self, column):
+        if not self._has(column):
+            return []
+        col = _ident(column)
+        df = self._query(f"SELECT DISTINCT {col} AS v FROM contracts WHERE {col} IS NOT NULL ORDER BY v")
+        return df["v"].tolist()
+
+    def supplier_options(self, min_contracts=1):
+        if not self._has("supplier_id", "supplier_name"):
+            return pd.DataFrame(columns=["supplier_id", "supplier_name", "contracts"])
+        return self._query(
+            "SELECT supplier_id, any_value(supplier_name) AS supplier_name, COUNT(*) AS contracts "
+            "FROM contracts WHERE supplier_id IS NOT NULL GROUP BY supplier_id "
+            "HAVING COUNT(*) >= ? ORDER BY supplier_name",
+            [min_contracts],
+        )
+
+    def summary(self):
+        anomaly = f"AVG({_ANOMALY_INT})" if self._has("is_anomaly") else "NULL"
+        duration = "AVG(contract_duration_days)" if self._has("contract_duration_days") else "NULL"
+        row = self._query(
+            f"SELECT COUNT(*) AS contracts, SUM(total_value_kes) AS total_value_kes, "
+            f"{anomaly} AS anomaly_rate, {duration} AS avg_duration_days FROM contracts"
+        ).iloc[0]
+        as_float = lambda v: float(v) if pd.notna(v) else float("nan")
+        return {
+            "contracts": int(row["contracts"]),
+            "total_value_kes": as_float(row["total_value_kes"]),
+            "anomaly_rate": as_float(row["anomaly_rate"]),
+            "avg_duration_days": as_float(row["avg_duration_days"]),
+        }
+
+    def date_bounds(self):
+        if not self._has("contract_start_date"):
+            return None, None
+        row = self._query(
+            "SELECT MIN(contract_start_date) AS lo, MAX(contract_start_date) AS hi FROM contracts"
+        ).iloc[0]
+        if pd.isna(row["lo"]):
+            return None, None
+        return pd.Timestamp(row["lo"]), pd.Timestamp(row["hi"])
+
+    # --- Filtered queries ---
+
+    def count(self, filters=NO_FILTERS, column_filters=None):
+        conditions, column_params = self._column_conditions(column_filters)
+        where, params = self._where(filters, *conditions)
+        return int(self._query(f"SELECT COUNT(*) AS n FROM contracts{where}",
+                               column_params + params)["n"].iloc[0])
+
+    def value_by_year(self, filters=NO_FILTERS):
+        where, params = self._where(filters, "year IS NOT NULL")
+        return self._query(
+            f"SELECT year, SUM(total_value_kes) AS total_value_kes FROM contracts{where} "
+            "GROUP BY year ORDER BY year",
+            params,
+        )
+
+    def top_buyers(self, filters=NO_FILTERS, n=10):
+        where, params = self._where(filters, "buyer_name IS NOT NULL")
+        return self._query(
+            f"SELECT buyer_name, SUM(total_value_kes) AS total_value_kes FROM contracts{where} "
+            "GROUP BY buyer_name ORDER BY total_value_kes DESC NULLS LAST LIMIT ?",
+            params + [n],
+        )
+
+    def top_suppliers(self, filters=NO_FILTERS, n=10):
+        if not self._has("supplier_id", "supplier_name"):
+            return pd.DataFrame(columns=["supplier_id", "supplier_name", "total_value_kes", "contracts"])
+        where, params = self._where(filters, "supplier_id IS NOT NULL")
+        return self._query(
+            "SELECT supplier_id, any_value(supplier_name) AS supplier_name, "
+            f"SUM(total_value_kes) AS total_value_kes, COUNT(*) AS contracts FROM contracts{where} "
+            "GROUP BY supplier_id ORDER BY total_value_kes DESC NULLS LAST LIMIT ?",
+            params + [n],
+        )
+
+    def procurement_method_counts(self, filters=NO_FILTERS):
+        if not self._has("tender_procurementmethod"):
+            return pd.DataFrame(columns=["tender_procurementmethod", "count"])
+        where, params = self._where(filters, "tender_procurementmethod IS NOT NULL")
+        return self._query(
+            f"SELECT tender_procurementmethod, COUNT(*) AS count FROM contracts{where} "
+            "GROUP BY tender_procurementmethod ORDER BY count DESC",
+            params,
+        )
+
+    def anomalies_by_cluster(self, filters=NO_FILTERS):
+        if not self._has("cluster", "is_anomaly"):
+            return pd.DataFrame(columns=["cluster", "is_anomaly"])
+        where, params = self._where(filters, "cluster IS NOT NULL")
+        return self._query(
+            f"SELECT cluster, SUM({_ANOMALY_INT}) AS is_anomaly FROM contracts{where} "
+            "GROUP BY cluster ORDER BY cluster",
+            params,
+        )
+
+    def cluster_distribution(self, filters=NO_FILTERS):
+        if not self._has("cluster"):
+            return pd.DataFrame(columns=["cluster", "count"])
+        where, params = self._where(filters, "cluster IS NOT NULL")
+        return self._query(
+            f"SELECT cluster, COUNT(*) AS count FROM contracts{where} "
+            "GROUP BY cluster ORDER BY count DESC",
+            params,
+        )
+
+    def rollup(self, freq, filters=NO_FILTERS):
+        columns = ["period", "total_value_kes", "contracts", "anomalies"]
+        if freq not in _DATE_TRUNC or not self._has("contract_start_date"):
+            return pd.DataFrame(columns=columns)
+        anomalies = f"SUM({_ANOMALY_INT})" if self._has("is_anomaly") else "0"
+        where, params = self._where(filters, "contract_start_date IS NOT NULL")
+        return self._query(
+            f"SELECT date_trunc('{_DATE_TRUNC[freq]}', contract_start_date) AS period, "
+            f"SUM(total_value_kes) AS total_value_kes, COUNT(*) AS contracts, "
+            f"{anomalies} AS anomalies FROM contracts{where} GROUP BY period ORDER BY period",
+            params,
+        )
+
+    def split_contracts(self, filters=NO_FILTERS, limit=500, columns=None):
+        empty = {"clusters": 0, "contracts": 0, "total_value_kes": 0.0}
+        if not self._has("is_split_suspect"):
+            return empty, pd.DataFrame()
+        where, params = self._where(filters, "is_split_suspect")
+        row = self._query(
+            "SELECT COUNT(DISTINCT split_cluster_id) AS clusters, COUNT(*) AS contracts, "
+            f"COALESCE(SUM(total_value_kes), 0) AS total_value_kes FROM contracts{where}",
+            params,
+        ).iloc[0]
+        summary = {
+            "clusters": int(row["clusters"]),
+            "contracts": int(row["contracts"]),
+            "total_value_kes": float(row["total_value_kes"]),
+        }
+        flagged = self._query(
+            f"SELECT {self._select(columns)} FROM contracts{where} "
+            "ORDER BY split_cluster_id, contract_start_date LIMIT ?",
+            params + [limit],
+        )
+        return summary, flagged
+
+    def leading_digit_counts(self, column, filters=NO_FILTERS):
+        counts = np.zeros(9, dtype=int)
+        if not self._has(column):
+            return counts
+        # Same rule as extract_leading_digits: first non-zero digit of the number's text
+        digit = (
+            "TRY_CAST(left(ltrim(regexp_replace(CAST(TRY_CAST({col} AS DOUBLE) AS VARCHAR), "
+            "'[^0-9]', '', 'g'), '0'), 1) AS INTEGER)"
+        ).format(col=_ident(column))
+        where, params = self._where(filters)
+        df = self._query(
+            f"SELECT d, COUNT(*) AS n FROM (SELECT {digit} AS d FROM contracts{where}) "
+            "WHERE d BETWEEN 1 AND 9 GROUP BY d",
+            params,
+        )
+        counts[df["d"].to_numpy(dtype=int) - 1] = df["n"].to_numpy(dtype=int)
+        return counts
+
+    def _select(self, columns):
+        if not columns:
+            return "*"
+        return ", ".join(_ident(c) for c in columns if self._has(c)) or "*"
+
+    def rows(self, filters=NO_FILTERS, columns=None, offset=0, limit=200, sort_by=None,
+             require_numeric=None, column_filters=None):
+        numeric = [f"TRY_CAST({_ident(c)} AS DOUBLE) IS NOT NULL"
+                   for c in require_numeric or [] if self._has(c)]
+        conditions, column_params = self._column_conditions(column_filters)
+        where, params = self._where(filters, *numeric, *conditions)
+        order = ""
+        if sort_by:
+            terms = [f"{_ident(c)} {'ASC' if asc else 'DESC'} NULLS LAST"
+                     for c, asc in sort_by if self._has(c)]
+            if terms:
+                order = " ORDER BY " + ", ".join(terms)
+        return self._query(
+            f"SELECT {self._select(columns)} FROM contracts{where}{order} LIMIT ? OFFSET ?",
+            column_params + params + [limit, offset],
+        )
+
+    def sample_rows(self, filters=NO_FILTERS, columns=None, n=20_000):
+        where, params = self._where(filters)
+        inner = f"SELECT {self._select(columns)} FROM contracts{where}"
+        if self.count(filters) <= n:
+            return self._query(inner, params)
+        return self._query(
+            f"SELECT * FROM ({inner}) USING SAMPLE reservoir({int(n)} ROWS) REPEATABLE (0)",
+            params,
+        )
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.backends.base import DataBackend, Filters, NO_FILTERS
+from dashboard.utils import aggregates
+from dashboard.utils.filtered_view import FilteredViewCache
+from dashboard.utils.time_index import rollup_by_period, slice_rollup
+
+_COMPARE = {
+    "=": lambda a, b: a == b, "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+}
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Values as text, spelled the way DuckDB casts them to VARCHAR."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+    elif pd.api.types.is_bool_dtype(values):
+        values = values.map({True: "true", False: "false"})
+    return values.astype("string")
+
+
+def _as_number(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.Series(np.nan, index=values.index)
+    return pd.to_numeric(values, errors="coerce").astype(float)
+
+
+def column_filter_mask(df: pd.DataFrame, conditions) -> pd.Series:
+    """Boolean mask of the rows matching every table_filter.Condition."""
+    mask = pd.Series(True, index=df.index)
+    for cond in conditions or []:
+        if cond.column not in df.columns:
+            continue
+        values = df[cond.column]
+        if cond.op in ("is blank", "is not blank"):
+            blank = values.isna() | (_as_text(values) == "").fillna(False)
+            mask &= blank if cond.op == "is blank" else ~blank
+            continue
+        if cond.op in _COMPARE and not isinstance(cond.value, str):
+            matched = _COMPARE[cond.op](_as_number(values), float(cond.value))
+        else:
+            text, value = _as_text(values), str(cond.value)
+            if not cond.case_sensitive:
+                text, value = text.str.lower(), value.lower()
+            if cond.op == "contains":
+                matched = text.str.contains(value, regex=False)
+            elif cond.op == "datestartswith":
+                matched = text.str.startswith(value)
+            else:
+                matched = _COMPARE[cond.op](text, value)
+        mask &= matched.fillna(False).astype(bool)
+    return mask
+
+
+class PandasBackend(DataBackend):
+    """
+    The in-memory path: merged_df in one pandas DataFrame.
+    Filtered views are memoized and shared across callbacks; unfiltered
+    monthly/quarterly rollups come from the precomputed tables.
+    """
+
+    name = "pandas"
+
+    def __init__(self, df: pd.DataFrame, version: str, date_index=None, rollups=None):
+        self.df = df
+        self.version = version
+        self.date_index = date_index
+        self.rollups = rollups or {}
+        self.views = FilteredViewCache(self)
+
+    def filtered(self, filters: Filters = NO_FILTERS) -> pd.DataFrame:
+        """Memoized filtered view; read-only (copy before mutating)."""
+        return self.views.get(*filters)
+
+    # --- Metadata ---
+
+    def columns(self):
+        return list(self.df.columns)
+
+    def numeric_columns(self):
+        return list(self.df.select_dtypes(include=[np.number]).columns)
+
+    def distinct(self, column):
+        if column not in self.df.columns:
+            return []
+        return sorted(self.df[column].dropna().unique())
+
+    def supplier_options(self, min_contracts=1):
+        if "supplier_id" not in self.df.columns:
+            return pd.DataFrame(columns=["supplier_id", "supplier_name", "contracts"])
+        options = (
+            self.df.groupby("supplier_id", as_index=False)
+            .agg(supplier_name=("supplier_name", "first"), contracts=("supplier_name", "size"))
+        )
+        return options[options["contracts"] >= min_contracts].sort_values("supplier_name")
+
+    def summary(self):
+        df = self.df
+        mean = lambda col: float(df[col].mean()) if col in df.columns else float("nan")
+        return {
+            "contracts": int(len(df)),
+            "total_value_kes": float(df["total_value_kes"].sum()),
+            "anomaly_rate": mean("is_anomaly"),
+            "avg_duration_days": mean("contract_duration_days"),
+        }
+
+    def date_bounds(self):
+        if self.date_index is None or not len(self.date_index):
+            return None, None
+        return self.date_index.min_date, self.date_index.max_date
+
+    # --- Filtered queries ---
+
+    def count(self, filters=NO_FILTERS, column_filters=None):
+        df = self.filtered(filters)
+        if column_filters:
+            return int(column_filter_mask(df, column_filters).sum())
+        return int(len(df))
+
+    def value_by_year(self, filters=NO_FILTERS):
+        return aggregates.value_by_year(self.filtered(filters))
+
+    def top_buyers(self, filters=NO_FILTERS, n=10):
+        return aggregates.top_buyers(self.filtered(filters), n)
+
+    def top_suppliers(self, filters=NO_FILTERS, n=10):
+        return aggregates.top_suppliers(self.filtered(filters), n)
+
+    def procurement_method_counts(self, filters=NO_FILTERS):
+        return aggregates.procurement_method_counts(self.filtered(filters))
+
+    def anomalies_by_cluster(self, filters=NO_FILTERS):
+        return aggregates.anomalies_by_cluster(self.filtered(filters))
+
+    def cluster_distribution(self, filters=NO_FILTERS):
+        return aggregates.cluster_distribution(self.filtered(filters))
+
+    def rollup(self, freq, filters=NO_FILTERS):
+        if filters.buyer or filters.year or filters.supplier or freq not in self.rollups:
+            # Only the date-range-only case is precomputed
+            return rollup_by_period(self.filtered(filters), freq)
+        return slice_rollup(self.rollups[freq], freq, filters.start_date, filters.end_date,
+                            df=self.df, date_index=self.date_index)
+
+    def split_contracts(self, filters=NO_FILTERS, limit=500, columns=None):
+        from dashboard.utils.split_detection import split_contract_clusters
+
+        flagged = split_contract_clusters(self.filtered(filters))
+        summary = {
+            "clusters": int(flagged["split_cluster_id"].nunique()) if len(flagged) else 0,
+            "contracts": int(len(flagged)),
+            "total_value_kes": float(flagged["total_value_kes"].sum()) if len(flagged) else 0.0,
+        }
+        flagged = flagged.head(limit)
+        if columns:
+            flagged = flagged[[c for c in columns if c in flagged.columns]]
+        return summary, flagged
+
+    def leading_digit_counts(self, column, filters=NO_FILTERS):
+        from dashboard.utils.benford_utils import leading_digit_counts
+
+        df = self.filtered(filters)
+        if column not in df.columns:
+            return np.zeros(9, dtype=int)
+        return leading_digit_counts(df[column])
+
+    def rows(self, filters=NO_FILTERS, columns=None, offset=0, limit=200, sort_by=None,
+             require_numeric=None, column_filters=None):
+        df = self.filtered(filters)
+        for col in require_numeric or []:
+            if col in df.columns:
+                df = df[pd.to_numeric(df[col], errors="coerce").notna()]
+        if column_filters:
+            df = df[column_filter_mask(df, column_filters)]
+        if sort_by:
+            by = [c for c, _ in sort_by if c in df.columns]
+            ascending = [asc for c, asc in sort_by if c in df.columns]
+            if by:
+                df = df.sort_values(by, ascending=ascending, kind="stable")
+        if columns:
+            df = df[[c for c in columns if c in df.columns]]
+        return df.iloc[offset:offset + limit]
+
+    def sample_rows(self, filters=NO_FILTERS, columns=None, n=20_000):
+        df = self.filtered(filters)
+        if columns:
+            df = df[[c for c in columns if c in df.columns]]
+        return df.sample(n, random_state=0) if len(df) > n else df
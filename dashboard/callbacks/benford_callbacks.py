@@ -1,12 +1,10 @@
 from dash import Input, Output, State, no_update
 from dash.exceptions import PreventUpdate
-import pandas as pd
-from dashboard.utils.benford_utils import run_benford_for_column
 
 import logging
 logging.basicConfig(level=logging.INFO)
 
-def register_benford_callbacks(app, merged_df):
+def register_benford_callbacks(app, store):
     """Register automatic Benford’s Law Analysis callbacks with logging."""
 
     @app.callback(
@@ -20,10 +18,11 @@ def register_benford_callbacks(app, merged_df):
             Input("benford-column", "value"),
             Input("buyer-filter", "value"),
             Input("year-filter", "value"),
+            Input("supplier-filter", "value"),
         ],
         prevent_initial_call=False  # allow auto-trigger on first load
     )
-    def on_auto_run_benford(pathname, benford_col, selected_buyer, selected_year):
+    def on_auto_run_benford(pathname, benford_col, selected_buyer, selected_year, selected_supplier):
         print("[LOG] Callback triggered for Benford page.")
 
         # Only run if user is on /benford
@@ -31,36 +30,48 @@ def register_benford_callbacks(app, merged_df):
             print("[LOG] Not on Benford page, skipping callback.")
             raise PreventUpdate
 
-        print("[LOG] Running Benford analysis...")
-        df = merged_df.copy()
+        if not store.ready:
+            print("[LOG] Data still warming up, skipping callback.")
+            raise PreventUpdate
+
+        # Heavy imports (matplotlib, scipy) deferred to first use
+        from dashboard.backends import Filters
+        from dashboard.utils.benford_utils import (
+            BENFORD_MIN_SAMPLES, benford_plot, benford_report, benford_summary_from_counts,
+        )
 
+        print("[LOG] Running Benford analysis...")
         # Apply filters if any
         if selected_buyer:
             print(f"[LOG] Filtering by buyer: {selected_buyer}")
-            df = df[df["buyer_name"] == selected_buyer]
         if selected_year:
             print(f"[LOG] Filtering by year: {selected_year}")
-            df = df[df["year"] == selected_year]
+        if selected_supplier:
+            print(f"[LOG] Filtering by supplier: {selected_supplier}")
+        backend = store.backend
+        filters = Filters(selected_buyer, selected_year, supplier=selected_supplier)
 
         # Determine column to check
         column_to_check = benford_col or "total_value_kes"
         print(f"[LOG] Using column for analysis: {column_to_check}")
 
-        if column_to_check not in df.columns:
+        if column_to_check not in backend.columns():
             print(f"[ERROR] Column '{column_to_check}' not found in dataframe.")
             return f"⚠️ Column '{column_to_check}' not found.", no_update, []
 
-        # Prepare numeric data
-        df[column_to_check] = pd.to_numeric(df[column_to_check], errors="coerce")
-        df = df.dropna(subset=[column_to_check])
-        if df.empty:
-            print(f"[WARN] No valid numeric data found in '{column_to_check}'.")
-            return f"⚠️ No valid numeric data in '{column_to_check}'.", no_update, []
-
-        # Run Benford analysis
+        # Run Benford analysis; the backend only returns the nine digit counts
         try:
             print("[LOG] Executing Benford analysis function...")
-            report, b64_img, suspect_df = run_benford_for_column(df, column_to_check)
+            counts = backend.leading_digit_counts(column_to_check, filters)
+            if counts.sum() == 0:
+                print(f"[WARN] No valid numeric data found in '{column_to_check}'.")
+                return f"⚠️ No valid numeric data in '{column_to_check}'.", no_update, []
+            summary = benford_summary_from_counts(counts, column_to_check)
+            if summary is None:
+                return f"Too few samples in '{column_to_check}' (<{BENFORD_MIN_SAMPLES} valid entries)", None, []
+            report, b64_img = benford_report(summary), benford_plot(summary)
+            suspect_df = backend.rows(filters, [column_to_check], limit=10,
+                                      require_numeric=[column_to_check])
             print("[LOG] Benford analysis completed successfully.")
         except Exception as e:
             print(f"[ERROR] Exception during Benford analysis: {e}")
@@ -74,9 +85,5 @@ def register_benford_callbacks(app, merged_df):
         table_data = suspect_df.to_dict("records") if not suspect_df.empty else []
 
         print(f"[LOG] Returning {len(table_data)} suspect records.")
-        
-        # Before returning
-        logging.info("📘 Benford Table Data Columns: %s", df.columns.tolist())
-        logging.info("📊 Sample rows:\n%s", df.head(5).to_string())
 
         return report, img_src, table_data
@@ -1,104 +1,230 @@
-from dash import Input, Output
+from dash import Input, Output, State
 from dash.exceptions import PreventUpdate
-import plotly.express as px
-import pandas as pd
+from dashboard.backends import Filters
 
+# Every main-dashboard output is driven by the same filter inputs
+FILTER_INPUTS = [
+    Input("buyer-filter", "value"),
+    Input("year-filter", "value"),
+    Input("date-range-filter", "start_date"),
+    Input("date-range-filter", "end_date"),
+]
 
-def register_callbacks(app, merged_df):
-    """Main dashboard callbacks (charts, tables)."""
+# Points drawn in the value-vs-duration scatter; larger selections are sampled
+SCATTER_MAX_POINTS = 20_000
+
+
+# --- Per-figure builders (plotly.express imported lazily to keep startup fast) ---
+
+def year_figure(backend, filters):
+    import plotly.express as px
+    return px.bar(
+        backend.value_by_year(filters),
+        x="year", y="total_value_kes",
+        title="Contract Value by Year"
+    )
+
+
+def buyers_figure(backend, filters):
+    import plotly.express as px
+    fig = px.bar(
+        backend.top_buyers(filters, 10),
+        x="buyer_name", y="total_value_kes",
+        title="Top 10 Buyers",
+        text_auto=True
+    )
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+
+def suppliers_figure(backend, filters):
+    """Top suppliers, with spelling variants merged by supplier_id."""
+    import plotly.express as px
+    fig = px.bar(
+        backend.top_suppliers(filters, 10),
+        x="supplier_name", y="total_value_kes",
+        hover_data=["supplier_id", "contracts"],
+        title="Top 10 Suppliers",
+        text_auto=True
+    )
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+
+def methods_figure(backend, filters):
+    import plotly.express as px
+    if "tender_procurementmethod" not in backend.columns():
+        return px.pie(names=["No Data"], values=[1])
+    return px.pie(
+        backend.procurement_method_counts(filters),
+        names="tender_procurementmethod", values="count",
+        title="Procurement Methods Distribution"
+    )
+
+
+def anomalies_figure(backend, filters):
+    import plotly.express as px
+    columns = backend.columns()
+    if "cluster" not in columns or "is_anomaly" not in columns:
+        return px.bar(title="Anomalies by Cluster (No Data)")
+    return px.bar(backend.anomalies_by_cluster(filters), x="cluster", y="is_anomaly",
+                  title="Anomalies by Cluster")
+
+
+def value_duration_figure(backend, filters):
+    import plotly.express as px
+    if "contract_duration_days" not in backend.columns():
+        return px.scatter(title="No duration data")
+    # A browser can't usefully draw millions of markers; plot a stable sample
+    df = backend.sample_rows(
+        filters, ["contract_duration_days", "total_value_kes", "is_anomaly"],
+        SCATTER_MAX_POINTS
+    )
+    return px.scatter(
+        df, x="contract_duration_days", y="total_value_kes",
+        color=df["is_anomaly"].map({True: "Anomaly", False: "Normal"})
+        if "is_anomaly" in df.columns else None,
+        title="Contract Value vs Duration",
+        labels={
+            "contract_duration_days": "Duration (Days)",
+            "total_value_kes": "Value (KES)"
+        }
+    )
+
+
+def cluster_figure(backend, filters):
+    import plotly.express as px
+    if "cluster" not in backend.columns():
+        return px.bar(title="Cluster Distribution (No Data)")
+    return px.bar(
+        backend.cluster_distribution(filters), x="cluster", y="count",
+        title="Cluster Distribution"
+    )
+
+
+# (component id, property, builder) — each gets its own callback
+DASHBOARD_OUTPUTS = [
+    ("contracts-by-year", "figure", year_figure),
+    ("top-buyers", "figure", buyers_figure),
+    ("top-suppliers", "figure", suppliers_figure),
+    ("procurement-methods", "figure", methods_figure),
+    ("anomalies-by-cluster", "figure", anomalies_figure),
+    ("value-vs-duration", "figure", value_duration_figure),
+    ("cluster-distribution", "figure", cluster_figure),
+]
+
+
+def register_callbacks(app, store):
+    """
+    Main dashboard callbacks (charts, tables) over the DataStore's backend.
+
+    Each chart has its own callback, so the browser requests them in parallel
+    and renders each as soon as it is ready; a slow chart no longer holds back
+    the rest. Queries go through store.backend, which either reads a memoized
+    pandas view or pushes the filter and aggregation down to DuckDB.
+    """
+
+    def current_filters(selected_buyer, selected_year, start_date, end_date):
+        if not store.ready:
+            raise PreventUpdate
+        filters = Filters(selected_buyer, selected_year, start_date, end_date)
+        if store.backend.count(filters) == 0:
+            raise PreventUpdate
+        return filters
+
+    def register_output(component_id, prop, build):
+        @app.callback(Output(component_id, prop), FILTER_INPUTS)
+        def update_output(selected_buyer, selected_year, start_date, end_date):
+            filters = current_filters(selected_buyer, selected_year, start_date, end_date)
+            return build(store.backend, filters)
+
+    for component_id, prop, build in DASHBOARD_OUTPUTS:
+        register_output(component_id, prop, build)
 
     @app.callback(
-        [
-            Output("contracts-by-year", "figure"),
-            Output("top-buyers", "figure"),
-            Output("procurement-methods", "figure"),
-            Output("anomalies-by-cluster", "figure"),
-            Output("value-vs-duration", "figure"),
-            Output("cluster-distribution", "figure"),
-            Output("contracts-table", "data"),
-        ],
-        [Input("buyer-filter", "value"),
-         Input("year-filter", "value")]
+        [Output("contracts-table", "data"),
+         Output("contracts-table", "page_count")],
+        [Input("contracts-table", "page_current"),
+         Input("contracts-table", "page_size"),
+         Input("contracts-table", "sort_by"),
+         Input("contracts-table", "filter_query")] + FILTER_INPUTS,
+        State("contracts-table", "columns")
     )
-    def update_dashboard(selected_buyer, selected_year):
-        df = merged_df.copy()
+    def update_table(page_current, page_size, sort_by, filter_query,
+                     selected_buyer, selected_year, start_date, end_date, columns):
+        """Server-side paging, sorting and column filtering: only the visible page is sent."""
+        from dashboard.utils.table_filter import parse_filter_query
 
-        if selected_buyer:
-            df = df[df["buyer_name"] == selected_buyer]
-        if selected_year:
-            df = df[df["year"] == selected_year]
+        filters = current_filters(selected_buyer, selected_year, start_date, end_date)
+        page_current = page_current or 0
+        page_size = page_size or 20
+        order = [(s["column_id"], s["direction"] == "asc") for s in (sort_by or [])]
+        column_filters = parse_filter_query(filter_query)
 
-        if df.empty:
+        backend = store.backend
+        page = backend.rows(filters, [c["id"] for c in columns or []] or None,
+                            offset=page_current * page_size,
+                            limit=page_size, sort_by=order, column_filters=column_filters)
+        page_count = -(-backend.count(filters, column_filters) // page_size)
+        return page.to_dict("records"), page_count
+
+    @app.callback(
+        Output("value-over-time", "figure"),
+        [Input("timeseries-granularity", "value")] + FILTER_INPUTS
+    )
+    def update_timeseries(freq, selected_buyer, selected_year, start_date, end_date):
+        if not store.ready:
             raise PreventUpdate
 
-        # --- Contracts by Year ---
-        fig_year = px.bar(
-            df.groupby("year", as_index=False)["total_value_kes"].sum(),
-            x="year", y="total_value_kes",
-            title="Contract Value by Year"
-        )
+        import plotly.express as px
+        from dashboard.utils.time_index import ROLLUP_FREQS
+
+        freq = freq if freq in ROLLUP_FREQS else "M"
+        filters = Filters(selected_buyer, selected_year, start_date, end_date)
+        rollup = store.backend.rollup(freq, filters)
+
+        if rollup is None or rollup.empty:
+            return px.line(title=f"{ROLLUP_FREQS[freq]} Contract Value (No Data)")
 
-        # --- Top Buyers ---
-        top_buyers = (
-            df.groupby("buyer_name", as_index=False)["total_value_kes"].sum()
-            .nlargest(10, "total_value_kes")
+        fig = px.line(
+            rollup, x="period", y="total_value_kes",
+            hover_data=["contracts", "anomalies"],
+            markers=True,
+            title=f"{ROLLUP_FREQS[freq]} Contract Value",
+            labels={"period": "Contract Start", "total_value_kes": "Value (KES)"}
         )
-        fig_buyers = px.bar(
-            top_buyers,
-            x="buyer_name", y="total_value_kes",
-            title="Top 10 Buyers",
-            text_auto=True
+        fig.add_bar(
+            x=rollup["period"], y=rollup["anomalies"],
+            name="Anomalies", yaxis="y2", opacity=0.4
         )
-        fig_buyers.update_xaxes(tickangle=45)
-
-        # --- Procurement Methods ---
-        if "tender_procurementmethod" in df.columns:
-            fig_methods = px.pie(
-                df, names="tender_procurementmethod",
-                title="Procurement Methods Distribution"
-            )
-        else:
-            fig_methods = px.pie(names=["No Data"], values=[1])
-
-        # --- Anomalies by Cluster ---
-        if "cluster" in df.columns and "is_anomaly" in df.columns:
-            anomalies = df.groupby("cluster", as_index=False)["is_anomaly"].sum()
-            fig_anomalies = px.bar(anomalies, x="cluster", y="is_anomaly",
-                                   title="Anomalies by Cluster")
-        else:
-            fig_anomalies = px.bar(title="Anomalies by Cluster (No Data)")
-
-        # --- Contract Value vs Duration ---
-        if "contract_duration_days" in df.columns:
-            fig_value_duration = px.scatter(
-                df, x="contract_duration_days", y="total_value_kes",
-                color=df["is_anomaly"].map({True: "Anomaly", False: "Normal"})
-                if "is_anomaly" in df.columns else None,
-                title="Contract Value vs Duration",
-                labels={
-                    "contract_duration_days": "Duration (Days)",
-                    "total_value_kes": "Value (KES)"
-                }
-            )
-        else:
-            fig_value_duration = px.scatter(title="No duration data")
-
-        # --- Cluster Distribution ---
-        if "cluster" in df.columns:
-            cluster_dist = df["cluster"].value_counts().reset_index()
-            cluster_dist.columns = ["cluster", "count"]
-            fig_cluster_dist = px.bar(
-                cluster_dist, x="cluster", y="count",
-                title="Cluster Distribution"
-            )
-        else:
-            fig_cluster_dist = px.bar(title="Cluster Distribution (No Data)")
-
-        # --- Table Data ---
-        table_data = df.head(200).to_dict("records")
-
-        return (
-            fig_year, fig_buyers, fig_methods,
-            fig_anomalies, fig_value_duration,
-            fig_cluster_dist, table_data
+        fig.update_layout(
+            yaxis2={"title": "Anomalies", "overlaying": "y", "side": "right", "showgrid": False},
+            legend={"orientation": "h"}
+        )
+        fig.update_xaxes(rangeslider_visible=True)
+        return fig
+
+    @app.callback(
+        [Output("split-summary", "children"),
+         Output("split-contracts-table", "data")],
+        FILTER_INPUTS,
+        State("split-contracts-table", "columns")
+    )
+    def update_split_panel(selected_buyer, selected_year, start_date, end_date, columns):
+        if not store.ready:
+            raise PreventUpdate
+
+        filters = Filters(selected_buyer, selected_year, start_date, end_date)
+        # Only the columns the table shows are sent to the browser
+        summary, flagged = store.backend.split_contracts(
+            filters, 500, [c["id"] for c in columns or []] or None
+        )
+        if not summary["contracts"]:
+            return "No suspected split contracts for the current filters.", []
+
+        text = (
+            f"{summary['clusters']:,} suspected clusters · "
+            f"{summary['contracts']:,} contracts · "
+            f"{summary['total_value_kes']:,.0f} KES"
         )
+        return text, flagged.to_dict("records")
@@ -1,36 +1,44 @@
-from dash import Dash, dcc, html, Input, Output
-from flask import Flask
+from dash import Dash, dcc, html, Input, Output, callback_context
+from dash.exceptions import PreventUpdate
+from flask import Flask, jsonify
 import sys, os
 
-# Local imports
-from dashboard.data_loader import load_merged_data
+# Local imports (kept light: pandas/plotly/matplotlib/scipy load on first use)
+from dashboard.data_store import DataStore
+from dashboard.utils.startup import StartupTimer
 from dashboard.layouts.main_dashboard import create_main_dashboard_layout
 from dashboard.layouts.benford_page import benford_page_layout
 from dashboard.callbacks.callbacks import register_callbacks
 from dashboard.callbacks.benford_callbacks import register_benford_callbacks
+from dashboard.api import register_api_routes
 
 # Ensure relative imports work
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-def init_dashboard(server: Flask):
-    """Initialize and mount Dash app on Flask server."""
+def init_dashboard(server: Flask, timer: StartupTimer = None):
+    """
+    Initialize and mount Dash app on Flask server.
+    The data backend is prepared in a background thread; until it is ready the pages
+    show a warming-up notice and /healthz/ready answers 503.
+    """
 
     print("🚀 [Dashboard] Initializing Dash application...")
+    timer = timer or StartupTimer()
 
-    # --- Load merged data once ---
-    merged_df = load_merged_data()
-    print(f"📦 [Dashboard] Loaded merged_df with shape: {merged_df.shape}")
+    # --- Load merged data once, in the background ---
+    store = DataStore(timer).start()
 
     # --- Create Dash app instance ---
-    app = Dash(
-        __name__,
-        server=server,
-        url_base_pathname="/dashboard/",
-        suppress_callback_exceptions=True,
-        title="PPRA Contracts Dashboard"
-    )
+    with timer.phase("create Dash app"):
+        app = Dash(
+            __name__,
+            server=server,
+            url_base_pathname="/dashboard/",
+            suppress_callback_exceptions=True,
+            title="PPRA Contracts Dashboard"
+        )
 
     # --- Define navigation bar ---
     def navbar():
@@ -56,23 +64,48 @@ def init_dashboard(server: Flask):
             }
         )
 
+    def warming_up_page():
+        if store.failed:
+            message = f"❌ Failed to load contract data: {store.error}"
+        else:
+            message = "⏳ Warming up — contract data is still loading. This page refreshes automatically."
+        return html.Div([
+            navbar(),
+            html.H3(message, style={"textAlign": "center", "marginTop": "40px", "color": "#555"})
+        ])
+
     # --- Base app layout ---
+    # The interval re-runs the router while data is warming up, then gets disabled.
     app.layout = html.Div([
         dcc.Location(id="url", refresh=False),
+        dcc.Interval(id="warmup-interval", interval=2000, disabled=False),
         html.Div(id="page-content")
     ])
 
     # --- Page router callback ---
     @app.callback(
-        Output("page-content", "children"),
-        [Input("url", "pathname")]
+        [Output("page-content", "children"),
+         Output("warmup-interval", "disabled")],
+        [Input("url", "pathname"),
+         Input("warmup-interval", "n_intervals")]
     )
-    def display_page(pathname):
+    def display_page(pathname, _n_intervals):
         """Router function for Dash pages"""
-        print(f"🔄 [Router] Navigating to: {pathname}")
+        triggered = [t["prop_id"] for t in callback_context.triggered]
+        polling = triggered == ["warmup-interval.n_intervals"]
+
+        if not store.ready:
+            if polling and not store.failed:
+                raise PreventUpdate
+            print(f"⏳ [Router] Data not ready, serving warm-up page for: {pathname}")
+            return warming_up_page(), store.failed
+
+        if not polling:
+            print(f"🔄 [Router] Navigating to: {pathname}")
+        backend = store.backend
 
         if pathname in ["/dashboard", "/dashboard/"]:
-            return html.Div([
+            page = html.Div([
                 navbar(),
                 html.H2("🏠 Welcome to the PPRA Contracts Intelligence Portal",
                         style={"textAlign": "center", "marginTop": "40px"}),
@@ -82,29 +115,50 @@ def init_dashboard(server: Flask):
 
         elif pathname == "/dashboard/main":
             print("📊 [Router] Loading Main Dashboard Page")
-            return html.Div([
+            page = html.Div([
                 navbar(),
-                create_main_dashboard_layout(merged_df)
+                create_main_dashboard_layout(backend)
             ])
 
         elif pathname == "/dashboard/benford":
             print("📈 [Router] Loading Benford Analysis Page")
-            return html.Div([
+            page = html.Div([
                 navbar(),
-                benford_page_layout(app, merged_df)
+                benford_page_layout(backend)
             ])
 
         else:
             print("❌ [Router] 404 - Page not found")
-            return html.Div([
+            page = html.Div([
                 navbar(),
                 html.H3("404 - Page not found", style={"textAlign": "center", "color": "red"})
             ])
 
+        return page, True
+
     # --- Register callbacks globally ---
     print("⚙️ [Dashboard] Registering callbacks...")
-    register_callbacks(app, merged_df)
-    register_benford_callbacks(app, merged_df)
+    with timer.phase("register callbacks"):
+        register_callbacks(app, store)
+        register_benford_callbacks(app, store)
 
     print("✅ [Dashboard] All callbacks registered successfully.")
+
+    # --- Read-only JSON API for other systems ---
+    register_api_routes(server, store)
+
+    # --- Health / readiness ---
+    @server.route("/healthz/ready")
+    def readiness():
+        """200 once the data backend is ready, 503 while warming up (or if loading failed)."""
+        body = {
+            "status": "ready" if store.ready else ("failed" if store.failed else "warming_up"),
+            "dataset_version": store.version,
+            "backend": store.backend_name,
+            "rows": store.backend.count() if store.ready else None,
+            "startup": timer.as_dict(),
+        }
+        if store.failed:
+            body["error"] = str(store.error)
+        return jsonify(body), 200 if store.ready else 503
     return app
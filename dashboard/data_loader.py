@@ -1,14 +1,102 @@
-import pandas as pd
+from contextlib import nullcontext
+import hashlib
 import os
+import sys
 
-def load_merged_data():
+# Primary dataset; a placeholder frame is used when it is missing
+DATA_PATH = os.path.join(os.path.dirname(__file__), "merged_ppra_data.csv")
+# Contract dates are reported in Kenyan time; values with a UTC offset are converted to it
+LOCAL_TZ = "Africa/Nairobi"
+# A time of day followed by Z or +HH:MM / -HHMM
+_UTC_OFFSET = r"\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|[+-]\d{2}:?\d{2})$"
+# Candidate formats for naive dates, tried per column (never per value).
+# Non-ISO dates in Kenyan records are day-first.
+DATE_FORMATS = (
+    "ISO8601",
+    "%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S",
+    "%d-%m-%Y", "%d-%m-%Y %H:%M:%S", "%d.%m.%Y",
+)
+# Values used to pick a column's format
+_FORMAT_SAMPLE = 2_000
+
+
+def dataset_version(path: str) -> str:
+    """Short fingerprint of the dataset file (path, size, mtime)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "placeholder"
+    raw = f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+def column_date_format(text, utc=False) -> str:
+    """The DATE_FORMATS entry that parses most of a sample of `text`."""
+    import pandas as pd
+
+    sample = text.dropna().head(_FORMAT_SAMPLE).str.strip()
+    sample = sample[sample != ""]
+    best, best_parsed = DATE_FORMATS[0], -1
+    for fmt in DATE_FORMATS:
+        parsed = int(pd.to_datetime(sample, format=fmt, errors="coerce", utc=utc).notna().sum())
+        if parsed > best_parsed:
+            best, best_parsed = fmt, parsed
+        if parsed == len(sample):
+            break
+    return best
+
+def _parse_dates(text, utc=False):
+    """
+    One vectorized parse with the column's format; only values that still come
+    out as NaT are retried one by one (format="mixed"), day-first unless the
+    column is ISO.
+    """
+    import pandas as pd
+
+    fmt = column_date_format(text, utc)
+    parsed = pd.to_datetime(text, format=fmt, errors="coerce", utc=utc)
+    retry = parsed.isna() & text.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(text[retry].str.strip(), format="mixed", errors="coerce",
+                                       dayfirst=fmt != "ISO8601", utc=utc)
+    return parsed
+
+def parse_local_dates(series):
+    """
+    Parse a date column to naive Kenyan local time.
+    Values with an explicit offset (or Z) are converted to LOCAL_TZ before the
+    zone is dropped; naive values are already local and are parsed as-is.
+    Each group is parsed with a single format chosen for the whole column, so
+    DD/MM dates are never read as MM/DD just because the day is <= 12.
+    """
+    import pandas as pd
+
+    text = series if pd.api.types.is_string_dtype(series) else series.astype("string")
+    # Only values longer than "YYYY-MM-DD HH:MM:SS" can carry an offset; skip the regex for the rest
+    long_values = text.str.len().fillna(0) > 19
+    has_offset = long_values.copy()
+    has_offset[long_values] = text[long_values].str.contains(_UTC_OFFSET, regex=True, na=False)
+    parsed = _parse_dates(text.where(~has_offset)).astype("datetime64[ns]")
+    if has_offset.any():
+        aware = _parse_dates(text[has_offset], utc=True)
+        parsed[has_offset] = aware.dt.tz_convert(LOCAL_TZ).dt.tz_localize(None).astype("datetime64[ns]")
+    return parsed
+
+def load_merged_data(timer=None):
     """
     Load merged PPRA dataset, or fallback to dummy data.
+    Pass a StartupTimer to record how long each loading step takes.
     """
-    DATA_PATH = os.path.join(os.path.dirname(__file__), "merged_ppra_data.csv")
+    def phase(name):
+        return timer.phase(name) if timer is not None else nullcontext()
+
+    # pandas is imported here rather than at module level to keep startup fast.
+    # If a backend import already pulled it in, that backend's phase counted it.
+    with phase("import pandas") if "pandas" not in sys.modules else nullcontext():
+        import pandas as pd
 
     try:
-        df = pd.read_csv(DATA_PATH)
+        with phase("read_csv"):
+            df = pd.read_csv(DATA_PATH)
     except FileNotFoundError:
         print(f"[⚠] Dataset not found at {DATA_PATH}. Using placeholder data.")
         df = pd.DataFrame([{
@@ -24,8 +112,18 @@ def load_merged_data():
             "title": ""
         }])
 
-    for col in ["total_value_kes", "contract_duration_days", "anomaly_score"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    with phase("coerce numeric columns"):
+        for col in ["total_value_kes", "contract_duration_days", "anomaly_score"]:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    # Parse contract dates once so date filters and rollups never re-parse
+    with phase("parse dates"):
+        for col in ["contract_start_date", "contract_end_date"]:
+            if col in df.columns:
+                df[col] = parse_local_dates(df[col])
+
+    # Used by the JSON API as the ETag basis
+    df.attrs["dataset_version"] = dataset_version(DATA_PATH)
 
     return df
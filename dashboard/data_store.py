@@ -0,0 +1,105 @@
+import os
+import threading
+
+from dashboard.backends import selected_backend
+from dashboard.data_loader import DATA_PATH, dataset_version, load_merged_data
+
+
+class DataStore:
+    """
+    Owns the data backend and prepares it in a background thread, so the Flask
+    server can bind (and serve a warming-up page) before the CSV is loaded.
+
+    The backend (pandas or DuckDB, see dashboard.backends) is what callbacks,
+    layouts and the API query; `df` is only set for the pandas backend.
+    """
+
+    def __init__(self, timer, backend_name=None):
+        self.timer = timer
+        self.backend_name = backend_name or selected_backend()
+        self.version = dataset_version(DATA_PATH)
+        self.backend = None
+        self.df = None
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set() and self.error is None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    def start(self):
+        """Kick off the background warm-up (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._warm_up, name="data-warmup", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def wait(self, timeout=None) -> bool:
+        """Block until warm-up finished (successfully or not)."""
+        return self._ready.wait(timeout)
+
+    def _load(self):
+        """Load merged_df and add the derived columns (supplier ids, split flags)."""
+        # After load_merged_data, so its "import pandas" phase still covers pandas
+        df = load_merged_data(self.timer)
+        with self.timer.phase("import entity resolution + split detection"):
+            from dashboard.utils.entity_resolution import resolve_suppliers
+            from dashboard.utils.split_detection import SPLIT_COLUMNS, detect_split_contracts
+
+        with self.timer.phase("resolve supplier entities"):
+            df[["supplier_id", "supplier_name"]] = resolve_suppliers(df)
+        with self.timer.phase("detect split contracts"):
+            df[SPLIT_COLUMNS] = detect_split_contracts(df, supplier_col="supplier_id")
+        print(f"📦 [Data] Loaded merged_df with shape: {df.shape}")
+        return df
+
+    def _build_pandas_backend(self):
+        df = self._load()
+        with self.timer.phase("import pandas backend"):
+            from dashboard.backends.pandas_backend import PandasBackend
+            from dashboard.utils.time_index import build_date_index, build_rollups
+
+        with self.timer.phase("build date index"):
+            date_index = build_date_index(df)
+        with self.timer.phase("precompute monthly/quarterly rollups"):
+            rollups = build_rollups(df)
+        self.df = df
+        return PandasBackend(df, self.version, date_index=date_index, rollups=rollups)
+
+    def _build_duckdb_backend(self):
+        # Also pulls in pandas and numpy, which load_merged_data then finds already imported
+        with self.timer.phase("import duckdb backend (duckdb, pandas)"):
+            from dashboard.backends.duckdb_backend import DuckDBBackend, parquet_path, write_parquet
+
+        path = parquet_path(self.version)
+        if os.path.exists(path):
+            print(f"🦆 [Data] Reusing prepared Parquet: {path}")
+        else:
+            df = self._load()
+            with self.timer.phase("write Parquet"):
+                write_parquet(df, path)
+            del df  # queries go to Parquet from here on
+        with self.timer.phase("open DuckDB"):
+            return DuckDBBackend(path, self.version)
+
+    def _warm_up(self):
+        print(f"🔥 [Data] Warming up the {self.backend_name} backend in the background...")
+        try:
+            with self.timer.phase("data warm-up (total)"):
+                if self.backend_name == "duckdb":
+                    self.backend = self._build_duckdb_backend()
+                else:
+                    self.backend = self._build_pandas_backend()
+        except Exception as e:
+            self.error = e
+            print(f"❌ [Data] Warm-up failed: {e}")
+        finally:
+            self._ready.set()
+            print(self.timer.report())
@@ -1,100 +1,26 @@
 from dash import html, dcc, dash_table
-import numpy as np
-import pandas as pd
 
-# ✅ Import the callback registration function
-from dashboard.callbacks.benford_callbacks import register_benford_callbacks
 
-
-def benford_page_layout(app, merged_df):
+def benford_page_layout(backend):
     """Layout for Benford’s Law page — dynamically generated, with clean handling."""
-
     print("🟢 [Benford] Page layout loaded")
 
-    # --- Log dataframe metadata ---
-    try:
-        print("🔍 [Benford] DataFrame Info:")
-        print(f"  → Shape: {merged_df.shape}")
-        print(f"  → Columns ({len(merged_df.columns)}): {list(merged_df.columns)}")
-        print("📋 [Benford] Sample:")
-        print(merged_df.head(3).to_dict(orient="records"))
-    except Exception as e:
-        print("❌ [Benford] Could not print DataFrame info:", e)
-
-    # --- Normalize column names ---
-    merged_df = merged_df.rename(columns={
-        "buyer": "buyer_name",
-        "supplier_name": "identifier_legalname",
-        "contract_title": "title",
-        "contract_value": "total_value_kes",
-        "contract_year": "year",
-    })
-
-    # --- Ensure required columns exist even if missing ---
-    required_columns = [
-        "buyer_name", "identifier_legalname", "title", "description",
-        "tender_procurementmethod", "tender_mainprocurementcategory",
-        "total_value_kes", "contract_duration_days", "year", "status",
-        "cluster", "anomaly_score", "is_anomaly"
-    ]
-    for col in required_columns:
-        if col not in merged_df.columns:
-            merged_df[col] = np.nan
-
-    # --- Convert numpy types & handle NaN safely ---
-    merged_df = merged_df.replace({np.nan: None})
-
-    # --- Format numeric columns ---
-    if "total_value_kes" in merged_df.columns:
-        merged_df["total_value_kes"] = merged_df["total_value_kes"].apply(
-            lambda x: f"{x:,.0f}" if isinstance(x, (int, float)) and not pd.isna(x) else ""
-        )
-
-    if "anomaly_score" in merged_df.columns:
-        merged_df["anomaly_score"] = merged_df["anomaly_score"].apply(
-            lambda x: round(x, 4) if isinstance(x, (int, float)) and not pd.isna(x) else ""
-        )
-
-    # --- Clean up boolean column ---
-    if "is_anomaly" in merged_df.columns:
-        merged_df["is_anomaly"] = merged_df["is_anomaly"].astype(bool)
-
-    # --- Register callbacks ---
-    register_benford_callbacks(app, merged_df)
-
-    # --- Dropdown setup ---
+    # --- Dropdown setup (small queries against the data backend) ---
+    columns = backend.columns()
     numeric_columns = [
         {"label": col.replace("_", " ").title(), "value": col}
-        for col in merged_df.select_dtypes(include=[np.number]).columns
+        for col in backend.numeric_columns()
     ]
 
-    buyers = sorted(merged_df["buyer_name"].dropna().unique()) if "buyer_name" in merged_df.columns else []
-    years = sorted(merged_df["year"].dropna().unique()) if "year" in merged_df.columns else []
+    buyers = backend.distinct("buyer_name")
+    years = backend.distinct("year")
 
-    # --- Table columns mapping ---
-    table_columns = [
-        {"name": "Buyer Name", "id": "buyer_name"},
-        {"name": "Supplier (Legal Name)", "id": "identifier_legalname"},
-        {"name": "Title", "id": "title"},
-        {"name": "Description", "id": "description"},
-        {"name": "Procurement Method", "id": "tender_procurementmethod"},
-        {"name": "Procurement Category", "id": "tender_mainprocurementcategory"},
-        {"name": "Total Value (KES)", "id": "total_value_kes"},
-        {"name": "Contract Duration (Days)", "id": "contract_duration_days"},
-        {"name": "Year", "id": "year"},
-        {"name": "Status", "id": "status"},
-        {"name": "Cluster", "id": "cluster"},
-        {"name": "Anomaly Score", "id": "anomaly_score"},
-        {"name": "Is Anomaly", "id": "is_anomaly"},
+    # Resolved suppliers with enough contracts for a meaningful Benford test
+    suppliers = [
+        {"label": f"{row.supplier_name} ({row.contracts:,})", "value": row.supplier_id}
+        for row in backend.supplier_options(min_contracts=30).itertuples()
     ]
 
-    print(f"🧩 [Benford] Final table columns: {[c['id'] for c in table_columns]}")
-
-    # --- Ensure DataTable-friendly data ---
-    data_records = merged_df.to_dict(orient="records")
-
-    print(f"✅ [Benford] Loaded {len(data_records)} records into DataTable")
-
     # --- Page layout ---
     return html.Div([
         dcc.Location(id="benford-url"),
@@ -123,13 +49,23 @@ def benford_page_layout(app, merged_df):
                 ),
             ], style={"flex": "1", "marginRight": "10px"}),
 
+            html.Div([
+                html.Label("Supplier:"),
+                dcc.Dropdown(
+                    id="supplier-filter",
+                    options=suppliers,
+                    placeholder="Select supplier (optional)",
+                    style={"width": "100%"},
+                ),
+            ], style={"flex": "1", "marginRight": "10px"}),
+
             html.Div([
                 html.Label("Numeric Column:"),
                 dcc.Dropdown(
                     id="benford-column",
                     options=numeric_columns,
                     placeholder="Choose a numeric column...",
-                    value="total_value_kes" if "total_value_kes" in merged_df.columns else None,
+                    value="total_value_kes" if "total_value_kes" in columns else None,
                     style={"width": "100%"},
                 ),
             ], style={"flex": "1"}),
@@ -181,7 +117,8 @@ def benford_page_layout(app, merged_df):
                         {"name": "Anomaly Score", "id": "anomaly_score"},
                         {"name": "Is Anomaly", "id": "is_anomaly"},
                     ],
-                    data=merged_df.to_dict("records"),
+                    # Filled by the Benford callback with a sample of the analysed column
+                    data=[],
                     page_size=10,
                     style_table={"overflowX": "auto", "marginTop": "15px"},
                     style_header={"backgroundColor": "#e9ecef", "fontWeight": "bold"},
@@ -1,13 +1,24 @@
 from dash import html, dcc, dash_table
-import plotly.express as px
-import numpy as np
-import pandas as pd
 
 
-def create_main_dashboard_layout(merged_df):
+def create_main_dashboard_layout(backend):
     """
     Returns the main dashboard layout for the PPRA Contracts Intelligence Dashboard.
+    `backend` is the DataStore's DataBackend (only small summaries are read here).
     """
+    # Deferred so importing the dashboard stays cheap
+    import pandas as pd
+    from dashboard.utils.time_index import ROLLUP_FREQS
+
+    summary = backend.summary()
+
+    # Bounds for the date picker (None when dates are unavailable)
+    min_date, max_date = backend.date_bounds()
+    if pd.notna(min_date):
+        min_date, max_date = pd.Timestamp(min_date).date(), pd.Timestamp(max_date).date()
+    else:
+        min_date = max_date = None
+
     return html.Div([
         html.H1("📊 PPRA Contracts Intelligence Dashboard", style={"textAlign": "center"}),
 
@@ -15,19 +26,19 @@ def create_main_dashboard_layout(merged_df):
         html.Div([
             html.Div([
                 html.H4("Total Contracts"),
-                html.H2(f"{len(merged_df):,}")
+                html.H2(f"{summary['contracts']:,}")
             ], className="card"),
             html.Div([
                 html.H4("Total Value (KES)"),
-                html.H2(f"{merged_df['total_value_kes'].sum():,.0f}")
+                html.H2(f"{summary['total_value_kes']:,.0f}")
             ], className="card"),
             html.Div([
                 html.H4("Anomalies (%)"),
-                html.H2(f"{(merged_df['is_anomaly'].mean() * 100):.2f}%")
+                html.H2(f"{(summary['anomaly_rate'] * 100):.2f}%")
             ], className="card"),
             html.Div([
                 html.H4("Avg. Duration (Days)"),
-                html.H2(f"{merged_df['contract_duration_days'].mean():.0f}")
+                html.H2(f"{summary['avg_duration_days']:.0f}")
             ], className="card")
         ], style={
             "display": "flex",
@@ -45,7 +56,7 @@ def create_main_dashboard_layout(merged_df):
                 dcc.Dropdown(
                     options=[
                         {"label": b, "value": b}
-                        for b in sorted(merged_df["buyer_name"].dropna().unique())
+                        for b in backend.distinct("buyer_name")
                     ],
                     id="buyer-filter",
                     placeholder="Select buyer..."
@@ -57,7 +68,7 @@ def create_main_dashboard_layout(merged_df):
                 dcc.Dropdown(
                     options=[
                         {"label": int(y), "value": int(y)}
-                        for y in sorted(merged_df["year"].dropna().unique())
+                        for y in backend.distinct("year")
                     ],
                     id="year-filter",
                     placeholder="Select year..."
@@ -66,64 +77,38 @@ def create_main_dashboard_layout(merged_df):
                 "width": "45%",
                 "display": "inline-block",
                 "marginLeft": "20px"
-            })
+            }),
+
+            html.Div([
+                html.Label("Filter by Contract Start Date:"),
+                dcc.DatePickerRange(
+                    id="date-range-filter",
+                    min_date_allowed=min_date,
+                    max_date_allowed=max_date,
+                    start_date_placeholder_text="From",
+                    end_date_placeholder_text="To",
+                    clearable=True
+                )
+            ], style={"marginTop": "15px"})
         ], style={"padding": "20px"}),
 
         html.Hr(),
 
-        # Charts Grid (with default figures to show initial visuals)
+        # Charts Grid (each figure is filled in by its own callback on page load)
         html.Div([
-            dcc.Graph(
-                id="contracts-by-year",
-                figure=px.bar(
-                    merged_df.groupby("year")["total_value_kes"].sum().reset_index(),
-                    x="year", y="total_value_kes",
-                    title="Contracts by Year"
-                )
-            ),
+            dcc.Graph(id="contracts-by-year"),
 
-            dcc.Graph(
-                id="top-buyers",
-                figure=px.bar(
-                    merged_df.groupby("buyer_name")["total_value_kes"].sum().nlargest(10).reset_index(),
-                    x="buyer_name", y="total_value_kes",
-                    title="Top 10 Buyers"
-                )
-            ),
+            dcc.Graph(id="top-buyers"),
 
-            dcc.Graph(
-                id="procurement-methods",
-                figure=px.pie(
-                    merged_df, names="tender_procurementmethod",
-                    title="Procurement Methods"
-                )
-            ),
+            dcc.Graph(id="top-suppliers"),
 
-            dcc.Graph(
-                id="anomalies-by-cluster",
-                figure=px.bar(
-                    merged_df.groupby("cluster")["is_anomaly"].mean().reset_index(),
-                    x="cluster", y="is_anomaly",
-                    title="Anomalies by Cluster"
-                )
-            ),
+            dcc.Graph(id="procurement-methods"),
 
-            dcc.Graph(
-                id="value-vs-duration",
-                figure=px.scatter(
-                    merged_df, x="contract_duration_days", y="total_value_kes",
-                    color="is_anomaly",
-                    title="Value vs Duration (with Anomalies)"
-                )
-            ),
+            dcc.Graph(id="anomalies-by-cluster"),
 
-            dcc.Graph(
-                id="cluster-distribution",
-                figure=px.histogram(
-                    merged_df, x="cluster",
-                    title="Cluster Distribution"
-                )
-            )
+            dcc.Graph(id="value-vs-duration"),
+
+            dcc.Graph(id="cluster-distribution")
         ], style={
             "display": "grid",
             "gridTemplateColumns": "1fr 1fr",
@@ -132,6 +117,59 @@ def create_main_dashboard_layout(merged_df):
 
         html.Hr(),
 
+        # Value over Time (range slider is client-side, so zooming is instant)
+        html.Div([
+            html.H2("📅 Value over Time", style={"textAlign": "center"}),
+            dcc.RadioItems(
+                id="timeseries-granularity",
+                options=[{"label": label, "value": freq} for freq, label in ROLLUP_FREQS.items()],
+                value="M",
+                inline=True,
+                style={"textAlign": "center"}
+            ),
+            dcc.Graph(id="value-over-time")
+        ], style={"padding": "20px"}),
+
+        html.Hr(),
+
+        # Possible contract splitting
+        html.Div([
+            html.H2("🧩 Possible Contract Splitting", style={"textAlign": "center"}),
+            html.P(
+                "Contracts from the same buyer to the same supplier, each just below a "
+                "procurement threshold and starting within a short window of each other.",
+                style={"textAlign": "center", "color": "#555"}
+            ),
+            html.H4(id="split-summary", style={"textAlign": "center"}),
+            dash_table.DataTable(
+                id="split-contracts-table",
+                columns=[
+                    {"name": "Cluster", "id": "split_cluster_id"},
+                    {"name": "Buyer", "id": "buyer_name"},
+                    {"name": "Supplier", "id": "identifier_legalname"},
+                    {"name": "Tender Title", "id": "title"},
+                    {"name": "Contract Value (KES)", "id": "total_value_kes"},
+                    {"name": "Threshold (KES)", "id": "split_threshold_kes"},
+                    {"name": "Start Date", "id": "contract_start_date"}
+                ],
+                page_size=15,
+                sort_action="native",
+                filter_action="native",
+                style_table={"overflowX": "auto"},
+                style_cell={
+                    "textAlign": "left",
+                    "padding": "5px",
+                    "fontSize": "14px"
+                },
+                style_header={
+                    "backgroundColor": "#f2f2f2",
+                    "fontWeight": "bold"
+                }
+            )
+        ], style={"padding": "20px"}),
+
+        html.Hr(),
+
         # Contract Explorer
         html.Div([
             html.H2("📂 Contract Explorer", style={
@@ -139,7 +177,7 @@ def create_main_dashboard_layout(merged_df):
                 "marginBottom": "10px"
             }),
             html.P(
-                "Explore individual contract records below. Use filters and search to drill down into specific contracts.",
+                "Explore individual contract records below. Use the filters above, column filters and sorting to drill down into specific contracts.",
                 style={"textAlign": "center", "color": "#555"}
             ),
 
@@ -154,12 +192,18 @@ def create_main_dashboard_layout(merged_df):
                     {"name": "Start Date", "id": "contract_start_date"},
                     {"name": "End Date", "id": "contract_end_date"},
                     {"name": "Year", "id": "year"},
-                    {"name": "Cluster", "id": "cluster"}
+                    {"name": "Cluster", "id": "cluster"},
+                    {"name": "Split Suspect", "id": "is_split_suspect"}
                 ],
-                data=merged_df.head(200).to_dict("records"),
+                # Paged, sorted and filtered server-side: only the visible page is sent
+                page_current=0,
                 page_size=25,
-                sort_action="native",
-                filter_action="native",
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
                 style_table={"overflowX": "auto"},
                 style_cell={
                     "textAlign": "left",
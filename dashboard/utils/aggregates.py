@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+# pandas is only needed for annotations here; keeping it out of the module
+# import keeps dashboard startup fast.
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _empty(columns) -> pd.DataFrame:
+    import pandas as pd
+    return pd.DataFrame(columns=columns)
+
+
+def filter_contracts(df: pd.DataFrame, buyer=None, year=None,
+                     start_date=None, end_date=None, date_index=None,
+                     supplier=None) -> pd.DataFrame:
+    """
+    Apply the dashboard filters (all optional).
+    The contract start-date range is applied first; with a DateIndex built on
+    `df` it is a binary search instead of a scan (rows come back in date order).
+    """
+    if start_date or end_date:
+        if date_index is not None:
+            df = df.iloc[date_index.positions_between(start_date, end_date)]
+        elif "contract_start_date" in df.columns:
+            from dashboard.utils.time_index import day_bounds
+            lo, hi = day_bounds(start_date, end_date)
+            dates = df["contract_start_date"]
+            mask = dates.notna()
+            if lo is not None:
+                mask &= dates >= lo
+            if hi is not None:
+                mask &= dates < hi
+            df = df[mask]
+    if buyer:
+        df = df[df["buyer_name"] == buyer]
+    if year:
+        df = df[df["year"] == year]
+    if supplier:
+        df = df[df["supplier_id"] == supplier]
+    return df
+
+
+def value_by_year(df: pd.DataFrame) -> pd.DataFrame:
+    """Total contract value per year."""
+    return df.groupby("year", as_index=False)["total_value_kes"].sum()
+
+
+def top_buyers(df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Top-n buyers by total contract value."""
+    return (
+        df.groupby("buyer_name", as_index=False)["total_value_kes"].sum()
+        .nlargest(n, "total_value_kes")
+    )
+
+
+def top_suppliers(df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Top-n suppliers by total contract value, grouped by resolved supplier_id."""
+    if "supplier_id" not in df.columns:
+        return _empty(["supplier_id", "supplier_name", "total_value_kes", "contracts"])
+    return (
+        df.groupby("supplier_id", as_index=False)
+        .agg(
+            supplier_name=("supplier_name", "first"),
+            total_value_kes=("total_value_kes", "sum"),
+            contracts=("total_value_kes", "size"),
+        )
+        .nlargest(n, "total_value_kes")
+    )
+
+
+def procurement_method_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """Number of contracts per procurement method."""
+    if "tender_procurementmethod" not in df.columns:
+        return _empty(["tender_procurementmethod", "count"])
+    counts = df["tender_procurementmethod"].value_counts().reset_index()
+    counts.columns = ["tender_procurementmethod", "count"]
+    return counts
+
+
+def anomalies_by_cluster(df: pd.DataFrame) -> pd.DataFrame:
+    """Number of flagged anomalies per cluster."""
+    if "cluster" not in df.columns or "is_anomaly" not in df.columns:
+        return _empty(["cluster", "is_anomaly"])
+    return df.groupby("cluster", as_index=False)["is_anomaly"].sum()
+
+
+def cluster_distribution(df: pd.DataFrame) -> pd.DataFrame:
+    """Number of contracts per cluster."""
+    if "cluster" not in df.columns:
+        return _empty(["cluster", "count"])
+    dist = df["cluster"].value_counts().reset_index()
+    dist.columns = ["cluster", "count"]
+    return dist
@@ -1,10 +1,25 @@
+import os
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.stats import chisquare
+# Figures are built directly on an Agg canvas: pyplot's global figure manager
+# isn't thread-safe, and plots are rendered from concurrent request threads
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from scipy.stats import binom, chisquare
 from io import BytesIO
 import base64
 
+# Bootstrap resamples per analysis (override with BENFORD_RESAMPLES); the API caps requests at the max
+BENFORD_RESAMPLES = int(os.environ.get("BENFORD_RESAMPLES", 2000))
+BENFORD_MAX_RESAMPLES = 20_000
+BENFORD_CONFIDENCE = 0.95
+# Below this the slice is too small to say anything; up to 30 the bands carry the result
+BENFORD_MIN_SAMPLES = 10
+# Nigrini's first-digit MAD conformity thresholds
+MAD_THRESHOLDS = [(0.006, "close conformity"), (0.012, "acceptable conformity"),
+                  (0.015, "marginal conformity")]
+
 def benford_expected_probs():
     """Return expected probabilities for Benford's Law (digits 1–9)."""
     return np.log10(1 + 1 / np.arange(1, 10))
@@ -22,55 +37,172 @@ def extract_leading_digits(series: pd.Series) -> pd.Series:
     cleaned = cleaned[cleaned.str.isdigit()].astype(int)
     return cleaned
 
-def run_benford_for_column(df: pd.DataFrame, col: str):
+def leading_digit_counts(series: pd.Series) -> np.ndarray:
+    """Counts of leading digits 1–9 in a column (non-numeric values ignored)."""
+    leading = extract_leading_digits(pd.to_numeric(series, errors="coerce").dropna())
+    return np.bincount(leading.to_numpy(dtype=int), minlength=10)[1:10]
+
+def mad_conformity(mad: float, null_high: float = 0.0):
+    """
+    Nigrini's label for a first-digit mean absolute deviation, or None when
+    the sample is too small for his cutoffs: his thresholds assume large n,
+    and if Benford data itself would often exceed the marginal cutoff at
+    this n (null_high above it) the label says nothing about the data.
+    """
+    if null_high > MAD_THRESHOLDS[-1][0]:
+        return None
+    for limit, label in MAD_THRESHOLDS:
+        if mad <= limit:
+            return label
+    return "nonconformity"
+
+def _resample_count(resamples: int) -> int:
+    return int(min(max(resamples, 1), BENFORD_MAX_RESAMPLES))
+
+def bootstrap_digit_bands(counts, resamples: int = BENFORD_RESAMPLES,
+                          confidence: float = BENFORD_CONFIDENCE, seed: int = 0):
     """
-    Run Benford’s Law test on a numeric column.
-    Returns:
-      - report (str)
-      - base64 graph (str)
-      - sample dataframe (pd.DataFrame)
+    Percentile bootstrap bands for the digit proportions.
+
+    Resampling n leading digits with replacement is a multinomial draw from the
+    observed proportions, so all resamples come from one (resamples x 9) NumPy
+    call instead of a Python loop. Seeded, so repeated requests agree.
+    Returns (low, high) proportions per digit.
     """
-    # Ensure column exists and numeric
-    if col not in df.columns:
-        return f"Column '{col}' not found.", None, pd.DataFrame()
+    counts = np.asarray(counts, dtype=np.int64)
+    n = int(counts.sum())
+    rng = np.random.default_rng(seed)
+    props = rng.multinomial(n, counts / n, size=_resample_count(resamples)) / n
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(props, [tail, 100 - tail], axis=0)
+    return low, high
 
-    series = pd.to_numeric(df[col], errors="coerce").dropna()
-    leading = extract_leading_digits(series)
+def mad_null_distribution(n: int, resamples: int = BENFORD_RESAMPLES, seed: int = 1):
+    """
+    MAD of `resamples` samples of n digits drawn from Benford's Law itself.
+    MAD is biased upward on small samples, so the observed MAD is compared
+    with what genuine Benford data of the same size produces, not with a
+    bootstrap of itself. One batched multinomial draw, seeded.
+    """
+    expected = benford_expected_probs()
+    rng = np.random.default_rng(seed)
+    props = rng.multinomial(n, expected, size=_resample_count(resamples)) / n
+    return np.abs(props - expected).mean(axis=1)
+
+def benford_digit_band(n: int, confidence: float = BENFORD_CONFIDENCE):
+    """
+    Simultaneous band for the nine digit counts of n values drawn from Benford's
+    Law. Each count is Binomial(n, p), and the nine two-sided tests split
+    1 - confidence between them (Bonferroni), so genuine Benford data has any
+    digit outside the band at most that often. Exact quantiles, no resampling.
+    Returns (low, high) counts; counts outside [low, high] are flagged.
+    """
+    tail = (1 - confidence) / 9 / 2
+    expected = benford_expected_probs()
+    low = binom.ppf(tail, n, expected).astype(int)
+    high = binom.ppf(1 - tail, n, expected).astype(int)
+    return low, high
 
-    if len(leading) < 30:
-        return f"Too few samples in '{col}' (<30 valid entries)", None, pd.DataFrame()
+def benford_summary_from_counts(counts, col: str, resamples: int = BENFORD_RESAMPLES):
+    """
+    Compute Benford's Law statistics from leading-digit counts (digits 1–9),
+    with bootstrap bands for each proportion, a simultaneous same-size
+    Benford band for flagging digits and a same-size reference band for MAD.
+    Returns a dict of plain Python values (JSON-serializable), or None when
+    there are fewer than BENFORD_MIN_SAMPLES valid leading digits.
+    """
+    counts = np.asarray(counts, dtype=float)
+    n = int(counts.sum())
+    if n < BENFORD_MIN_SAMPLES:
+        return None
 
     # Actual and expected distributions
-    counts = leading.value_counts(normalize=True).sort_index()
-    actual = counts.reindex(range(1, 10), fill_value=0).values
+    actual = counts / n
     expected = benford_expected_probs()
 
     # Chi-square goodness-of-fit test
-    stat, p = chisquare(actual * len(leading), expected * len(leading))
+    stat, p = chisquare(actual * n, expected * n)
     dev_pct = np.abs(actual - expected) / expected * 100
     suspicious_digits = [i + 1 for i, d in enumerate(dev_pct) if d > 15]
 
-    # --- Visualization ---
-    fig, ax = plt.subplots(figsize=(6, 4))
+    low, high = bootstrap_digit_bands(counts, resamples)
+    band_low, band_high = benford_digit_band(n)
+    outside = [i + 1 for i in range(9) if not band_low[i] <= counts[i] <= band_high[i]]
+
+    # Mean absolute deviation against what Benford data of this size would show
+    mad = float(np.abs(actual - expected).mean())
+    null_mads = mad_null_distribution(n, resamples)
+    tail = (1 - BENFORD_CONFIDENCE) / 2 * 100
+    null_low, null_high = (float(v) for v in np.percentile(null_mads, [tail, 100 - tail]))
+
+    return {
+        "column": col,
+        "n": n,
+        "digits": list(range(1, 10)),
+        "actual": [float(a) for a in actual],
+        "expected": [float(e) for e in expected],
+        "actual_low": [float(v) for v in low],
+        "actual_high": [float(v) for v in high],
+        "expected_low": [float(v) / n for v in band_low],
+        "expected_high": [float(v) / n for v in band_high],
+        "chi2": float(stat),
+        "p_value": float(p),
+        "suspicious_digits": suspicious_digits,
+        "digits_outside_band": outside,
+        "mad": mad,
+        "mad_null_band": [null_low, null_high],
+        "mad_p_value": float((null_mads >= mad).mean()),
+        "mad_conformity": mad_conformity(mad, null_high),
+        "confidence": BENFORD_CONFIDENCE,
+        "resamples": _resample_count(resamples),
+    }
+
+def benford_report(summary: dict) -> str:
+    """Text summary shown above the Benford chart."""
+    confidence = f"{summary['confidence']:.0%}"
+    null_low, null_high = summary["mad_null_band"]
+    conformity = summary["mad_conformity"] or "too few values for Nigrini's cutoffs"
+    report = (
+        f"Column '{summary['column']}' (n={summary['n']:,}) — χ²={summary['chi2']:.2f}, p={summary['p_value']:.4f}. "
+        f"Suspicious digits (>|15% deviation|): {summary['suspicious_digits'] or 'None'}\n"
+        f"MAD={summary['mad']:.4f} vs {null_low:.4f}–{null_high:.4f} expected from Benford data of this size "
+        f"(p={summary['mad_p_value']:.3f}); {conformity}. "
+        f"Digits outside the {confidence} Benford band for this n (all nine digits jointly): "
+        f"{summary['digits_outside_band'] or 'None'}"
+    )
+    if summary["n"] < 30:
+        report += "\n⚠️ Small sample: the χ² test is unreliable here; read the bands instead."
+    return report
+
+def benford_plot(summary: dict) -> str:
+    """Expected vs actual digit proportions as a base64 PNG data URI."""
+    actual = np.array(summary["actual"])
+    expected = np.array(summary["expected"])
+
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     ax.bar(np.arange(1, 10) - 0.2, expected, width=0.4, label="Expected (Benford)", alpha=0.7)
     ax.bar(np.arange(1, 10) + 0.2, actual, width=0.4, label="Actual", alpha=0.7)
+    if "expected_low" in summary:
+        # Where genuine Benford data of this size lands (all nine digits jointly)
+        yerr = [expected - np.array(summary["expected_low"]), np.array(summary["expected_high"]) - expected]
+        ax.errorbar(np.arange(1, 10) - 0.2, expected, yerr=np.clip(yerr, 0, None), fmt="none",
+                    ecolor="gray", capsize=3, label=f"{summary['confidence']:.0%} Benford band")
+    if "actual_low" in summary:
+        # Bootstrap band around each actual proportion
+        yerr = [actual - np.array(summary["actual_low"]), np.array(summary["actual_high"]) - actual]
+        ax.errorbar(np.arange(1, 10) + 0.2, actual, yerr=np.clip(yerr, 0, None), fmt="none",
+                    ecolor="black", capsize=3, label=f"{summary['confidence']:.0%} bootstrap band")
     ax.set_xticks(np.arange(1, 10))
     ax.set_xlabel("Leading Digit")
     ax.set_ylabel("Proportion")
-    ax.set_title(f"Benford's Law - {col}")
+    ax.set_title(f"Benford's Law - {summary['column']} (n={summary['n']:,}, MAD={summary['mad']:.4f})")
     ax.legend()
 
     # Encode image
     buf = BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format="png")
-    plt.close(fig)
+    fig.tight_layout()
+    fig.savefig(buf, format="png")
     b64 = base64.b64encode(buf.getvalue()).decode()
-
-    # Result summary
-    report = (
-        f"Column '{col}' — χ²={stat:.2f}, p={p:.4f}. "
-        f"Suspicious digits (>|15% deviation|): {suspicious_digits or 'None'}"
-    )
-
-    return report, f"data:image/png;base64,{b64}", df[[col]].head(10)
+    return f"data:image/png;base64,{b64}"
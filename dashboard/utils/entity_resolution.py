@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Persisted name -> supplier id mapping, so reloads only resolve new names
+SUPPLIER_MAPPING_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "supplier_mapping.json"
+)
+
+# MinHash / LSH parameters. Changing any of them invalidates the saved mapping.
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard usually share a bucket
+SHINGLE_SIZE = 3
+MATCH_THRESHOLD = 0.8  # estimated Jaccard needed to merge two names
+MINHASH_SEED = 20240601
+NORMALIZATION_VERSION = 3  # bump when normalize_supplier_names changes
+_CHUNK = 5_000  # names hashed per batch (bounds memory)
+
+# Legal-form suffixes dropped from the end of the match key ("Ltd" vs "Limited" etc.)
+_LEGAL_FORMS = {
+    "LTD", "LIMITED", "CO", "COMPANY", "CORP", "CORPORATION", "INC",
+    "INCORPORATED", "PLC", "LLC", "LLP",
+}
+# Country suffixes, also dropped only when trailing: "Acme (K) Ltd", "Acme Kenya Limited"
+_COUNTRY_SUFFIXES = {"K", "KE", "KENYA"}
+# Trailing legal-form words / one trailing country word, always leaving the first word.
+# The country is kept after OF: "Co-operative Bank of Kenya Ltd" -> "COOPERATIVE BANK OF KENYA"
+_TRAILING_LEGAL_FORMS = re.compile(r"(?<=\S)(?:\s+(?:" + "|".join(sorted(_LEGAL_FORMS)) + r"))+$")
+_TRAILING_COUNTRY = re.compile(r"(?<=\S)(?<!\bOF)\s+(?:" + "|".join(sorted(_COUNTRY_SUFFIXES)) + r")$")
+# Punctuation deleted rather than spaced, so "P.L.C." == "PLC" and "Co-operative" == "Cooperative"
+_JOINING_PUNCTUATION = r"[.'’`]|(?<=[A-Z0-9])-(?=[A-Z0-9])"
+_PRIME = np.uint64(4294967291)  # largest prime below 2**32
+
+
+def normalize_supplier_names(names: pd.Series) -> pd.Series:
+    """
+    Match key for supplier names: upper-case, dots/apostrophes/in-word hyphens
+    deleted, other punctuation turned into spaces, whitespace collapsed,
+    trailing legal-form and country suffixes removed.
+    "Acme (K) Ltd.", "ACME LIMITED" and "Acme P.L.C." all become "ACME"; words
+    elsewhere in the name are kept, so "Kenya Airways" stays distinct from "Airways Ltd".
+    """
+    cleaned = (
+        names.fillna("").astype(str).str.upper()
+        .str.replace(_JOINING_PUNCTUATION, "", regex=True)
+        .str.replace("&", " AND ", regex=False)
+        .str.replace(r"[^A-Z0-9 ]+", " ", regex=True)
+        .str.split().str.join(" ")
+    )
+    return (
+        cleaned.str.replace(_TRAILING_LEGAL_FORMS, "", regex=True)
+        .str.replace(_TRAILING_COUNTRY, "", regex=True)
+        .str.replace(_TRAILING_LEGAL_FORMS, "", regex=True)
+    )
+
+
+def _minhash_params():
+    rng = np.random.default_rng(MINHASH_SEED)
+    a = rng.integers(1, int(_PRIME), MINHASH_PERMUTATIONS, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), MINHASH_PERMUTATIONS, dtype=np.uint64)
+    return a, b
+
+
+def _shingle_hashes(key: str):
+    if len(key) <= SHINGLE_SIZE:
+        grams = {key}
+    else:
+        grams = {key[i:i + SHINGLE_SIZE] for i in range(len(key) - SHINGLE_SIZE + 1)}
+    return [zlib.crc32(g.encode()) for g in grams]
+
+
+def minhash_signatures(keys) -> np.ndarray:
+    """(len(keys), MINHASH_PERMUTATIONS) uint64 MinHash signatures of character shingles."""
+    a, b = _minhash_params()
+    out = np.empty((len(keys), MINHASH_PERMUTATIONS), dtype=np.uint64)
+    for start in range(0, len(keys), _CHUNK):
+        chunk = keys[start:start + _CHUNK]
+        hashes = [_shingle_hashes(k) for k in chunk]
+        lengths = np.fromiter((len(h) for h in hashes), dtype=np.int64, count=len(hashes))
+        flat = np.fromiter((x for h in hashes for x in h), dtype=np.uint64, count=int(lengths.sum()))
+        # (a*x + b) mod p for every shingle and permutation; a, x < 2**32 so no overflow
+        permuted = (flat[:, None] * a[None, :] + b[None, :]) % _PRIME
+        offsets = np.r_[0, np.cumsum(lengths)[:-1]]
+        out[start:start + len(chunk)] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return out
+
+
+def _lsh_candidate_pairs(signatures: np.ndarray) -> np.ndarray:
+    """(m, 2) index pairs that share at least one LSH band bucket."""
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    mult = np.array([0x9E3779B97F4A7C15 >> i for i in range(rows)], dtype=np.uint64)
+    pairs = []
+    with np.errstate(over="ignore"):
+        for band in range(LSH_BANDS):
+            chunk = signatures[:, band * rows:(band + 1) * rows]
+            bucket = (chunk * mult).sum(axis=1, dtype=np.uint64)
+            order = np.argsort(bucket, kind="stable")
+            sorted_bucket = bucket[order]
+            # Link every member of a bucket to the bucket's first member
+            first = np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]]
+            head = order[np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))]
+            linked = ~first
+            pairs.append(np.column_stack([head[linked], order[linked]]))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def _components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """Connected-component label per node (union-find with path halving)."""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in pairs.tolist():
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    return np.array([find(i) for i in range(n)], dtype=np.int64)
+
+
+def _supplier_id(key: str) -> str:
+    return "SUP-" + hashlib.sha1(key.encode()).hexdigest()[:10]
+
+
+def _mapping_params():
+    return {
+        "permutations": MINHASH_PERMUTATIONS,
+        "bands": LSH_BANDS,
+        "shingle": SHINGLE_SIZE,
+        "threshold": MATCH_THRESHOLD,
+        "seed": MINHASH_SEED,
+        "normalization": NORMALIZATION_VERSION,
+    }
+
+
+def load_supplier_mapping(path: str = SUPPLIER_MAPPING_PATH) -> dict:
+    """Saved mapping, or an empty one when missing or built with other parameters."""
+    empty = {"params": _mapping_params(), "keys": {}, "suppliers": {}}
+    try:
+        with open(path, encoding="utf-8") as f:
+            mapping = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if mapping.get("params") != _mapping_params():
+        print("[⚠] Supplier mapping was built with different parameters; rebuilding.")
+        return empty
+    return mapping
+
+
+def save_supplier_mapping(mapping: dict, path: str = SUPPLIER_MAPPING_PATH):
+    # Unique temp file: with the debug reloader two processes may save at once
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(mapping, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def resolve_new_keys(new_keys, mapping: dict) -> dict:
+    """
+    Assign supplier ids to match keys not yet in `mapping` (updated in place).
+    New keys are MinHashed and LSH-bucketed together with one representative
+    signature per known supplier; candidate pairs above MATCH_THRESHOLD are merged.
+    Returns {key: supplier_id} for the new keys.
+    """
+    if not len(new_keys):
+        return {}
+
+    known_ids = list(mapping["suppliers"])
+    known_sigs = np.array(
+        [mapping["suppliers"][sid]["signature"] for sid in known_ids], dtype=np.uint64
+    ).reshape(len(known_ids), MINHASH_PERMUTATIONS)
+    new_sigs = minhash_signatures(list(new_keys))
+    sigs = np.vstack([known_sigs, new_sigs])
+    n_known = len(known_ids)
+
+    pairs = _lsh_candidate_pairs(sigs)
+    # Known suppliers are already distinct; only pairs touching a new key count
+    pairs = pairs[(pairs >= n_known).any(axis=1)]
+    similarity = (sigs[pairs[:, 0]] == sigs[pairs[:, 1]]).mean(axis=1)
+    labels = _components(len(sigs), pairs[similarity >= MATCH_THRESHOLD])
+
+    # Component label is its smallest member: a known supplier if one joined
+    assigned = {}
+    for offset, key in enumerate(new_keys):
+        root = labels[n_known + offset]
+        if root < n_known:
+            sid = known_ids[root]
+        else:
+            root_key = new_keys[root - n_known]
+            sid = _supplier_id(root_key)
+            if sid not in mapping["suppliers"]:
+                mapping["suppliers"][sid] = {
+                    "key": root_key,
+                    "signature": [int(x) for x in new_sigs[root - n_known]],
+                }
+        assigned[key] = sid
+        mapping["keys"][key] = sid
+    return assigned
+
+
+def resolve_suppliers(df: pd.DataFrame, name_col: str = "identifier_legalname",
+                      mapping_path: str = SUPPLIER_MAPPING_PATH) -> pd.DataFrame:
+    """
+    Canonical supplier per row, aligned to `df.index`:
+      - supplier_id: stable id shared by spelling variants of one company
+      - supplier_name: most common raw spelling within that id
+    Only names missing from the persisted mapping are hashed and bucketed.
+    """
+    if name_col not in df.columns:
+        return pd.DataFrame({"supplier_id": None, "supplier_name": None}, index=df.index)
+
+    keys = normalize_supplier_names(df[name_col])
+    mapping = load_supplier_mapping(mapping_path)
+    unique_keys = pd.unique(keys[keys != ""])
+    new_keys = [k for k in unique_keys if k not in mapping["keys"]]
+
+    if new_keys:
+        print(f"🔗 [Suppliers] Resolving {len(new_keys):,} new supplier names "
+              f"({len(unique_keys) - len(new_keys):,} already mapped)")
+        resolve_new_keys(new_keys, mapping)
+        try:
+            save_supplier_mapping(mapping, mapping_path)
+        except OSError as e:
+            print(f"[⚠] Could not save supplier mapping: {e}")
+
+    supplier_id = keys.map(mapping["keys"])
+
+    # Display name: the most frequent raw spelling per supplier id
+    spellings = (
+        pd.DataFrame({"supplier_id": supplier_id, "name": df[name_col]})
+        .dropna()
+        .value_counts()
+        .reset_index()
+        .drop_duplicates("supplier_id")
+        .set_index("supplier_id")["name"]
+    )
+    return pd.DataFrame({
+        "supplier_id": supplier_id,
+        "supplier_name": supplier_id.map(spellings),
+    }, index=df.index)
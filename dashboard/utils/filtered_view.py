@@ -0,0 +1,65 @@
+from collections import OrderedDict
+import threading
+
+from dashboard.utils.aggregates import filter_contracts
+
+# Filtered frames kept per filter combination (most recently used wins)
+FILTERED_VIEW_CACHE_SIZE = 16
+
+
+class FilteredViewCache:
+    """
+    Memoized filter_contracts() over a PandasBackend (anything with df,
+    date_index and version), shared by every callback.
+
+    The per-figure callbacks fire concurrently with the same filters; the first
+    one computes the view and the others wait for it instead of repeating the
+    work. Returned frames are shared, so callers must not mutate them.
+    """
+
+    def __init__(self, source, maxsize: int = FILTERED_VIEW_CACHE_SIZE):
+        self._source = source
+        self._maxsize = maxsize
+        self._views = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get(self, buyer=None, year=None, start_date=None, end_date=None, supplier=None):
+        source = self._source
+        key = (source.version, buyer or None, year or None,
+               start_date or None, end_date or None, supplier or None)
+
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = self._pending[key] = threading.Event()
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                if key in self._views:
+                    return self._views[key]
+            # The owner failed; compute our own copy below without caching it
+
+        try:
+            view = filter_contracts(source.df, buyer, year, start_date, end_date,
+                                    date_index=source.date_index, supplier=supplier)
+            if owner:
+                with self._lock:
+                    self._views[key] = view
+                    while len(self._views) > self._maxsize:
+                        self._views.popitem(last=False)
+            return view
+        finally:
+            if owner:
+                with self._lock:
+                    del self._pending[key]
+                event.set()
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# Value thresholds (KES) above which a stricter procurement method applies.
+# Adjust to the thresholds in force for the period being audited.
+SPLIT_THRESHOLDS_KES = (500_000, 1_000_000, 2_000_000, 5_000_000, 10_000_000)
+# A contract is "just below" a threshold when it is within this fraction under it
+SPLIT_BELOW_PCT = 0.10
+# Contracts to the same buyer/supplier pair must start within this many days
+SPLIT_WINDOW_DAYS = 30
+# Minimum number of just-below contracts in one window to flag a cluster
+SPLIT_MIN_CONTRACTS = 2
+
+SPLIT_COLUMNS = ["is_split_suspect", "split_cluster_id", "split_threshold_kes"]
+
+
+def detect_split_contracts(
+    df: pd.DataFrame,
+    thresholds=SPLIT_THRESHOLDS_KES,
+    below_pct: float = SPLIT_BELOW_PCT,
+    window_days: int = SPLIT_WINDOW_DAYS,
+    min_contracts: int = SPLIT_MIN_CONTRACTS,
+    supplier_col: str = "identifier_legalname",
+    date_col: str = "contract_start_date",
+) -> pd.DataFrame:
+    """
+    Flag likely contract splitting: at least `min_contracts` contracts from the
+    same buyer to the same supplier, each just below the same threshold, whose
+    start dates fall within `window_days` of each other.
+
+    Candidates are sorted once by (buyer, supplier, threshold, date) and every
+    window is found with a binary search, so this is O(n log n) rather than a
+    pairwise comparison.
+
+    Returns a frame aligned to `df.index` with SPLIT_COLUMNS:
+      - is_split_suspect (bool)
+      - split_cluster_id (int, -1 when not flagged)
+      - split_threshold_kes (float, NaN when not flagged)
+    """
+    n = len(df)
+    result = pd.DataFrame({
+        "is_split_suspect": np.zeros(n, dtype=bool),
+        "split_cluster_id": np.full(n, -1, dtype=np.int64),
+        "split_threshold_kes": np.full(n, np.nan),
+    }, index=df.index)
+
+    required = ["buyer_name", supplier_col, "total_value_kes", date_col]
+    if n == 0 or any(c not in df.columns for c in required):
+        return result
+    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        return result
+
+    # --- Which threshold (if any) is each contract just below? ---
+    limits = np.sort(np.asarray(thresholds, dtype=float))
+    values = df["total_value_kes"].to_numpy(dtype=float, na_value=np.nan)
+    k = np.searchsorted(limits, values, side="right")  # first threshold > value
+    limit = limits[np.minimum(k, len(limits) - 1)]
+    near = (k < len(limits)) & (values >= limit * (1 - below_pct)) & (values < limit)
+    near &= (df[date_col].notna() & df["buyer_name"].notna() & df[supplier_col].notna()).to_numpy()
+
+    cand = np.flatnonzero(near)
+    if len(cand) < min_contracts:
+        return result
+
+    # --- Sort candidates by (group, day) ---
+    sub = df.iloc[cand]
+    group = (
+        pd.DataFrame({
+            "buyer": sub["buyer_name"].to_numpy(),
+            "supplier": sub[supplier_col].to_numpy(),
+            "limit": limit[cand],
+        })
+        .groupby(["buyer", "supplier", "limit"], sort=False)
+        .ngroup()
+        .to_numpy(dtype=np.int64)
+    )
+    days = sub[date_col].to_numpy(dtype="datetime64[D]").astype(np.int64)
+    order = np.lexsort((days, group))
+    group, days, cand = group[order], days[order], cand[order]
+
+    # One monotone key per (group, day); groups are spaced further apart than
+    # any window, so a single searchsorted never crosses a group boundary.
+    span = int(days.max() - days.min()) + window_days + 1
+    key = group * span + (days - days.min())
+    left = np.searchsorted(key, key - window_days, side="left")
+    ends = np.flatnonzero(np.arange(len(key)) - left + 1 >= min_contracts)
+
+    # Every row inside a qualifying window [left, end] is a member
+    cover = np.zeros(len(key) + 1, dtype=np.int64)
+    np.add.at(cover, left[ends], 1)
+    np.add.at(cover, ends + 1, -1)
+    member = np.cumsum(cover[:-1]) > 0
+
+    # Consecutive members of the same group within the window form one cluster
+    prev_member = np.r_[False, member[:-1]]
+    same_group = np.r_[False, group[1:] == group[:-1]]
+    close = np.r_[False, np.diff(days) <= window_days]
+    starts = member & ~(prev_member & same_group & close)
+    cluster_id = np.cumsum(starts) - 1
+
+    rows = cand[member]
+    result.iloc[rows, 0] = True
+    result.iloc[rows, 1] = cluster_id[member]
+    result.iloc[rows, 2] = limit[rows]
+    return result
+
+
+def split_contract_clusters(df: pd.DataFrame) -> pd.DataFrame:
+    """Flagged contracts only, ordered by cluster and start date."""
+    if "is_split_suspect" not in df.columns:
+        return df.iloc[0:0]
+    flagged = df[df["is_split_suspect"]]
+    return flagged.sort_values(["split_cluster_id", "contract_start_date"])
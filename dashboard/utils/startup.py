@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+import threading
+import time
+
+
+class StartupTimer:
+    """
+    Records how long each startup phase takes so slow restarts can be traced
+    to a specific import, load or preprocessing step.
+    Safe to use from the main thread and the background warm-up thread.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._phases = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as a named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._phases.append({
+                "phase": name,
+                "thread": threading.current_thread().name,
+                "seconds": round(seconds, 4),
+            })
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was created (process start, roughly)."""
+        return time.perf_counter() - self.started_at
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            phases = list(self._phases)
+        return {"elapsed_seconds": round(self.elapsed(), 4), "phases": phases}
+
+    def report(self) -> str:
+        """Human-readable startup breakdown, slowest phases first."""
+        data = self.as_dict()
+        lines = ["⏱️ [Startup] Time breakdown:"]
+        for p in sorted(data["phases"], key=lambda p: p["seconds"], reverse=True):
+            lines.append(f"  {p['seconds']:>8.3f}s  {p['phase']}  ({p['thread']})")
+        lines.append(f"  {data['elapsed_seconds']:>8.3f}s  total since start")
+        return "\n".join(lines)
@@ -0,0 +1,62 @@
+import re
+from typing import NamedTuple, Optional
+
+# Dash spells most operators two ways; both map to the symbolic form
+_OPERATOR_NAMES = {"eq": "=", "ne": "!=", "lt": "<", "le": "<=", "gt": ">", "ge": ">="}
+
+_TERM = re.compile(
+    r"^\{(?P<column>(?:[^}\\]|\\.)+)\}\s+(?:"
+    r"(?P<unary>is (?:not )?blank)"
+    r"|(?P<case>[is]?)(?P<op>contains|datestartswith|eq|ne|lt|le|gt|ge|>=|<=|!=|<|>|=)\s*(?P<value>.*)"
+    r")$"
+)
+_QUOTED = re.compile(r"""^(["'`])(?P<text>.*)\1$""", re.DOTALL)
+
+
+class Condition(NamedTuple):
+    """
+    One column filter from the table's filter row.
+
+    - "contains" and "datestartswith" match the value's text.
+    - Comparisons with a number compare numerically (non-numbers never match);
+      with a string they compare the text.
+    - "is blank" / "is not blank" test for a missing or empty value.
+    """
+    column: str
+    op: str
+    value: object = None
+    case_sensitive: bool = True
+
+
+def _parse_value(raw: str):
+    raw = raw.strip()
+    quoted = _QUOTED.match(raw)
+    if quoted:
+        return re.sub(r"\\(.)", r"\1", quoted.group("text"))
+    try:
+        number = float(raw)
+    except ValueError:
+        return raw
+    return int(number) if number.is_integer() and "." not in raw and "e" not in raw.lower() else number
+
+
+def parse_filter_query(query: Optional[str]) -> list:
+    """
+    DataTable filter_query (e.g. '{year} >= 2020 && {title} icontains "road"')
+    -> list of Conditions. Terms the backends can't evaluate are dropped.
+    """
+    conditions = []
+    for term in (query or "").split(" && "):
+        match = _TERM.match(term.strip())
+        if not match:
+            continue
+        column = re.sub(r"\\(.)", r"\1", match.group("column"))
+        if match.group("unary"):
+            conditions.append(Condition(column, match.group("unary")))
+            continue
+        value = _parse_value(match.group("value"))
+        if value == "":
+            continue
+        op = _OPERATOR_NAMES.get(match.group("op"), match.group("op"))
+        conditions.append(Condition(column, op, value, match.group("case") != "i"))
+    return conditions
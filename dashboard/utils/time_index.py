@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# Rollup granularities offered by the time-series chart
+ROLLUP_FREQS = {"M": "Monthly", "Q": "Quarterly"}
+
+
+def day_bounds(start=None, end=None):
+    """Inclusive [start, end] dates -> half-open [lo, hi) timestamps (hi is end + 1 day)."""
+    lo = pd.Timestamp(start).normalize() if start else None
+    hi = pd.Timestamp(end).normalize() + pd.Timedelta(days=1) if end else None
+    return lo, hi
+
+
+class DateIndex:
+    """
+    Sorted positional index over a datetime64 column.
+    Date-range lookups are two binary searches instead of a full scan;
+    rows with missing dates are left out of the index.
+    """
+
+    def __init__(self, dates: pd.Series):
+        values = dates.to_numpy(dtype="datetime64[ns]")
+        valid = np.flatnonzero(~np.isnat(values))
+        order = np.argsort(values[valid], kind="stable")
+        self.positions = valid[order]
+        self.sorted_values = values[valid][order]
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def min_date(self):
+        return pd.Timestamp(self.sorted_values[0]) if len(self) else None
+
+    @property
+    def max_date(self):
+        return pd.Timestamp(self.sorted_values[-1]) if len(self) else None
+
+    def positions_between(self, start=None, end=None) -> np.ndarray:
+        """Row positions (in date order) whose date falls in the inclusive day range."""
+        return self.positions_in(*day_bounds(start, end))
+
+    def positions_in(self, lo=None, hi=None) -> np.ndarray:
+        """Row positions (in date order) with lo <= date < hi (either bound may be None)."""
+        i = 0 if lo is None else np.searchsorted(self.sorted_values, lo.to_datetime64(), "left")
+        j = len(self) if hi is None else np.searchsorted(self.sorted_values, hi.to_datetime64(), "left")
+        return self.positions[i:j]
+
+
+def build_date_index(df: pd.DataFrame, col: str = "contract_start_date"):
+    """DateIndex over `col`, or None when the column is missing or not datetime."""
+    if col not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[col]):
+        return None
+    return DateIndex(df[col])
+
+
+def rollup_by_period(df: pd.DataFrame, freq: str, col: str = "contract_start_date") -> pd.DataFrame:
+    """
+    Value / contract count / anomaly count per period of `col`.
+    Returns columns: period (period start), total_value_kes, contracts, anomalies;
+    sorted by period.
+    """
+    columns = ["period", "total_value_kes", "contracts", "anomalies"]
+    if col not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    dated = df[df[col].notna()]
+    period = dated[col].dt.to_period(freq).dt.start_time
+    anomalies = (
+        dated["is_anomaly"].fillna(0).astype(int)
+        if "is_anomaly" in dated.columns else pd.Series(0, index=dated.index)
+    )
+    rollup = (
+        pd.DataFrame({
+            "period": period,
+            "total_value_kes": dated["total_value_kes"],
+            "anomalies": anomalies,
+        })
+        .groupby("period", as_index=False)
+        .agg(
+            total_value_kes=("total_value_kes", "sum"),
+            contracts=("total_value_kes", "size"),
+            anomalies=("anomalies", "sum"),
+        )
+        .sort_values("period", ignore_index=True)
+    )
+    return rollup[columns]
+
+
+def build_rollups(df: pd.DataFrame, col: str = "contract_start_date") -> dict:
+    """Precomputed rollups for every granularity in ROLLUP_FREQS."""
+    return {freq: rollup_by_period(df, freq, col) for freq in ROLLUP_FREQS}
+
+
+def slice_rollup(rollup: pd.DataFrame, freq: str, start=None, end=None,
+                 df: pd.DataFrame = None, date_index: DateIndex = None) -> pd.DataFrame:
+    """
+    Rollup restricted to the inclusive day range, matching rollup_by_period() on
+    the date-filtered rows. Whole periods inside the range come from the
+    precomputed `rollup` by binary search; the partial first and last periods
+    are recomputed from just their rows via `date_index`.
+    """
+    if rollup.empty or not (start or end):
+        return rollup
+    lo, hi = day_bounds(start, end)
+
+    # [inner_lo, inner_hi): the periods lying entirely inside [lo, hi)
+    inner_lo = inner_hi = None
+    if lo is not None:
+        first = lo.to_period(freq)
+        inner_lo = lo if first.start_time == lo else (first + 1).start_time
+    if hi is not None:
+        inner_hi = hi.to_period(freq).start_time
+    if inner_lo is not None and inner_hi is not None and inner_lo >= inner_hi:
+        # No whole period in range: roll up the range's rows directly
+        return rollup_by_period(df.iloc[date_index.positions_in(lo, hi)], freq)
+
+    periods = rollup["period"].to_numpy(dtype="datetime64[ns]")
+    i = 0 if inner_lo is None else np.searchsorted(periods, inner_lo.to_datetime64(), "left")
+    j = len(rollup) if inner_hi is None else np.searchsorted(periods, inner_hi.to_datetime64(), "left")
+
+    edges = []
+    if lo is not None and lo < inner_lo:
+        edges.append(date_index.positions_in(lo, inner_lo))
+    if hi is not None and inner_hi < hi:
+        edges.append(date_index.positions_in(inner_hi, hi))
+    if not edges:
+        return rollup.iloc[i:j].reset_index(drop=True)
+
+    edge_rollup = rollup_by_period(df.iloc[np.concatenate(edges)], freq)
+    return (
+        pd.concat([edge_rollup, rollup.iloc[i:j]], ignore_index=True)
+        .sort_values("period", ignore_index=True)
+    )
@@ -0,0 +1,441 @@
+"""
+Load generator for the dashboard's Dash callback endpoints.
+
+Replays recorded `_dash-update-component` payloads (the main dashboard
+callbacks, on_auto_run_benford and the page router) against a running app.py
+server with N concurrent simulated users, then reports throughput,
+p50/p95/p99 latency and error rates.
+
+    python loadtest/run_loadtest.py --users 10 --duration 60
+    python loadtest/run_loadtest.py --users 20 --output loadtest/results/20u.json
+    python loadtest/run_loadtest.py --users 20 --compare loadtest/results/20u.json
+    python loadtest/run_loadtest.py --har recorded-session.har --users 5
+
+Only the standard library is used, so it runs from any environment that can
+reach the server.
+"""
+import argparse
+import glob
+import hashlib
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+DEFAULT_PAYLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payloads")
+DASH_UPDATE_PATH = "/dashboard/_dash-update-component"
+READY_PATH = "/healthz/ready"
+YEARS_PATH = "/api/aggregates/by-year"
+# Parallel connections a browser opens to one host (HTTP/1.1)
+BROWSER_CONNECTIONS = 6
+
+
+# --- Payloads ---
+
+def load_scenarios(payload_dir: str):
+    """Scenario files (*.json) from `payload_dir`, in file-name order."""
+    scenarios = []
+    for path in sorted(glob.glob(os.path.join(payload_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            scenario = json.load(f)
+        scenario.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        scenario.setdefault("weight", 1)
+        scenario.setdefault("concurrent", False)
+        scenarios.append(scenario)
+    return scenarios
+
+
+def load_har(path: str):
+    """
+    One sequential scenario from a browser HAR export: every POST to
+    _dash-update-component, in recorded order.
+    """
+    with open(path, encoding="utf-8") as f:
+        har = json.load(f)
+    requests = []
+    for entry in har.get("log", {}).get("entries", []):
+        req = entry.get("request", {})
+        if req.get("method") != "POST" or not req.get("url", "").endswith("_dash-update-component"):
+            continue
+        body = json.loads(req.get("postData", {}).get("text") or "{}")
+        requests.append({"label": body.get("output", "?"), "body": body})
+    name = os.path.splitext(os.path.basename(path))[0]
+    return [{"name": name, "description": f"Recorded from {path}", "weight": 1,
+             "concurrent": False, "requests": requests}]
+
+
+def set_year_filter(scenarios, year: int):
+    """
+    Point every recorded year-filter selection at `year` (in place).
+    Recorded payloads carry an example year; if it isn't in the dataset every
+    callback raises PreventUpdate and answers 204 instantly, inflating throughput.
+    """
+    for scenario in scenarios:
+        for item in scenario["requests"]:
+            body = item["body"]
+            for prop in body.get("inputs", []) + body.get("state", []):
+                if prop.get("id") == "year-filter" and prop.get("property") == "value" \
+                        and prop.get("value") is not None:
+                    prop["value"] = year
+
+
+def scenarios_fingerprint(scenarios) -> str:
+    """Hash of the replayed payloads, to tell whether two result files are comparable."""
+    raw = json.dumps(scenarios, sort_keys=True).encode()
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+# --- HTTP ---
+
+class Client:
+    """Keep-alive HTTP connection per thread, reopened after a server-side close."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self, fresh=False):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or fresh:
+            if conn is not None:
+                conn.close()
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def request(self, method: str, path: str, body: bytes = None):
+        """Returns (status, response bytes); raises on network errors."""
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in (0, 1):
+            conn = self._connection(fresh=attempt > 0)
+            try:
+                conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Stale keep-alive connection; retry once on a new one
+                if attempt:
+                    raise
+
+
+def wait_until_ready(client: Client, timeout: float):
+    """Poll /healthz/ready until the server has finished warming up."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            status, _ = client.request("GET", READY_PATH)
+            if status == 200:
+                return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            sys.exit(f"Server not ready after {timeout:.0f}s ({client.host}:{client.port}{READY_PATH})")
+        time.sleep(1)
+
+
+def busiest_year(client: Client) -> int:
+    """Year with the highest total contract value, from the JSON API."""
+    status, body = client.request("GET", YEARS_PATH)
+    if status != 200:
+        sys.exit(f"Could not pick a year: {YEARS_PATH} answered {status}. Pass --year instead.")
+    years = json.loads(body).get("data") or []
+    if not years:
+        sys.exit(f"Could not pick a year: {YEARS_PATH} returned no years. Pass --year instead.")
+    return int(max(years, key=lambda row: row.get("total_value_kes") or 0)["year"])
+
+
+# --- Load generation ---
+
+class Recorder:
+    def __init__(self):
+        self.requests = []
+        self.scenarios = []
+        self._lock = threading.Lock()
+
+    def add_request(self, scenario, label, started, latency, status, error):
+        with self._lock:
+            self.requests.append((scenario, label, started, latency, status, error))
+
+    def add_scenario(self, scenario, started, latency, outcome):
+        with self._lock:
+            self.scenarios.append((scenario, started, latency, outcome))
+
+
+def simulate_user(user, scenarios, client, recorder, args, t0, end):
+    """One simulated analyst: pick a scenario, fire its callbacks, think, repeat."""
+    rng = random.Random(args.seed * 1000 + user)
+    weights = [s["weight"] for s in scenarios]
+    pool = ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS)
+
+    def send(scenario, item):
+        body = json.dumps(item["body"]).encode()
+        started = time.perf_counter()
+        status, error = None, None
+        try:
+            status, _ = client.request("POST", DASH_UPDATE_PATH, body)
+            if status >= 400:
+                error = f"HTTP {status}"
+        except Exception as e:
+            error = type(e).__name__
+        latency = time.perf_counter() - started
+        recorder.add_request(scenario["name"], item["label"], started - t0, latency, status, error)
+        return outcome(status, error)
+
+    try:
+        while time.perf_counter() < end:
+            scenario = rng.choices(scenarios, weights)[0]
+            started = time.perf_counter()
+            if scenario["concurrent"]:
+                outcomes = list(pool.map(lambda item: send(scenario, item), scenario["requests"]))
+            else:
+                outcomes = [send(scenario, item) for item in scenario["requests"]]
+            # A run is only as good as its worst callback
+            worst = "error" if "error" in outcomes else "no_update" if "no_update" in outcomes else "ok"
+            recorder.add_scenario(scenario["name"], started - t0, time.perf_counter() - started, worst)
+            if args.think_time > 0:
+                time.sleep(rng.uniform(0.5, 1.5) * args.think_time)
+    finally:
+        pool.shutdown(wait=True)
+
+
+# --- Reporting ---
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def outcome(status, error):
+    """Classify a callback response as "ok", "error" or "no_update".
+
+    Dash answers 204 when a callback raises PreventUpdate. Nothing was rendered,
+    so it is neither a success nor a failure and is counted on its own.
+    """
+    if error is not None:
+        return "error"
+    return "no_update" if status == 204 else "ok"
+
+
+def latency_stats(samples, seconds):
+    """Stats over (latency, outcome) pairs.
+
+    204 "no update" answers are cheap and render nothing, so they are left out
+    of throughput and latency and reported as their own count and rate.
+    """
+    total = len(samples)
+    errors = sum(1 for _, o in samples if o == "error")
+    no_updates = sum(1 for _, o in samples if o == "no_update")
+    values = sorted(lat for lat, o in samples if o != "no_update")
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+    return {
+        "count": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "no_updates": no_updates,
+        "no_update_rate": round(no_updates / total, 4) if total else 0.0,
+        "throughput_rps": round(len(values) / seconds, 2) if seconds else 0.0,
+        "mean_ms": ms(sum(values) / len(values)) if values else None,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(values[-1]) if values else None,
+    }
+
+
+def summarize(recorder, args, scenarios, measured_seconds):
+    """Stats over samples that started after the warm-up period."""
+    requests = [r for r in recorder.requests if r[2] >= args.warmup]
+    runs = [s for s in recorder.scenarios if s[1] >= args.warmup]
+
+    request_samples = [(r[0], r[1], r[3], outcome(r[4], r[5])) for r in requests]
+    run_samples = [(s[0], s[2], s[3]) for s in runs]
+
+    def group(rows):
+        grouped = {}
+        for *key, latency, result in rows:
+            grouped.setdefault(key[-1], []).append((latency, result))
+        return {k: latency_stats(v, measured_seconds) for k, v in sorted(grouped.items())}
+
+    error_counts = {}
+    for r in requests:
+        if r[5]:
+            error_counts[r[5]] = error_counts.get(r[5], 0) + 1
+
+    return {
+        "config": {
+            "url": args.url,
+            "users": args.users,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "think_time_s": args.think_time,
+            "seed": args.seed,
+            "year": args.year,
+            "scenarios": [s["name"] for s in scenarios],
+            "payloads": scenarios_fingerprint(scenarios),
+        },
+        "environment": {
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "overall": latency_stats([(lat, o) for *_, lat, o in request_samples], measured_seconds),
+        "by_callback": group(request_samples),
+        "by_scenario": group(run_samples),
+        "error_types": error_counts,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(results):
+    cfg = results["config"]
+    print(f"\n📊 Load test: {cfg['users']} users × {cfg['duration_s']}s "
+          f"(warm-up {cfg['warmup_s']}s, seed {cfg['seed']}, payloads {cfg['payloads']})")
+    header = (f"{'':42} {'count':>7} {'rps':>8} {'err%':>6} {'204%':>6} "
+              f"{'p50ms':>9} {'p95ms':>9} {'p99ms':>9}")
+
+    def row(name, s):
+        fmt = lambda v: f"{v:>9.1f}" if v is not None else f"{'-':>9}"
+        return (f"{name[:42]:42} {s['count']:>7} {s['throughput_rps']:>8.2f} "
+                f"{s['error_rate'] * 100:>6.2f} {s['no_update_rate'] * 100:>6.2f} "
+                f"{fmt(s['p50_ms'])} {fmt(s['p95_ms'])} {fmt(s['p99_ms'])}")
+
+    print(header)
+    print(row("ALL CALLBACK REQUESTS", results["overall"]))
+    print("-- per scenario (wall time of all its callbacks) --")
+    for name, s in results["by_scenario"].items():
+        print(row(name, s))
+    print("-- per callback --")
+    for name, s in results["by_callback"].items():
+        print(row(name, s))
+    if results["error_types"]:
+        print(f"Errors: {results['error_types']}")
+    if results["overall"]["no_updates"]:
+        print(f"⚠️  {results['overall']['no_updates']} callbacks answered 204 (PreventUpdate) and rendered nothing; "
+              "they are excluded from rps and latency.")
+
+
+def compare(results, baseline, max_regression):
+    """Print deltas against a previous run; returns False on a regression."""
+    if results["config"] != baseline["config"]:
+        print("⚠️  Baseline was recorded with a different configuration; deltas may not be comparable.")
+
+    ok = True
+    print(f"\n🔁 Compared with baseline (commit {baseline['environment'].get('git_commit')}):")
+    sections = [("ALL", results["overall"], baseline["overall"])]
+    sections += [(name, s, baseline["by_scenario"][name])
+                 for name, s in results["by_scenario"].items() if name in baseline["by_scenario"]]
+    for name, cur, base in sections:
+        deltas = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if cur[key] is None or not base[key]:
+                continue
+            change = (cur[key] - base[key]) / base[key]
+            deltas.append(f"{key} {base[key]}→{cur[key]} ({change:+.0%})")
+            worse = -change if key == "throughput_rps" else change
+            if key in ("throughput_rps", "p95_ms") and worse > max_regression:
+                ok = False
+        # Error and 204 rate gates on the overall figure only; per-scenario samples are small
+        for key in ("error_rate", "no_update_rate"):
+            if name == "ALL" and cur[key] - base.get(key, 0.0) > 0.01:
+                ok = False
+            deltas.append(f"{key} {base.get(key, 0.0):.2%}→{cur[key]:.2%}")
+        print(f"  {name}: " + ", ".join(deltas))
+    print("✅ No scaling regression." if ok else
+          f"❌ Regression beyond {max_regression:.0%} (throughput/p95) or +1pp errors/204s.")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Base URL of the running app.py server")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds (after warm-up)")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds of load excluded from the stats")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between a user's scenarios (s)")
+    parser.add_argument("--seed", type=int, default=1, help="Scenario-choice seed (keep fixed to compare runs)")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout (s)")
+    parser.add_argument("--payloads", default=DEFAULT_PAYLOAD_DIR, help="Directory of scenario JSON files")
+    parser.add_argument("--har", help="Replay the Dash callbacks recorded in a browser HAR export instead")
+    parser.add_argument("--year", type=int,
+                        help="Year for the year-filter scenarios (default: the dataset's highest-value year)")
+    parser.add_argument("--output", help="Write results as JSON (use as a later --compare baseline)")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed throughput drop / p95 growth vs baseline before exiting 1")
+    args = parser.parse_args(argv)
+
+    scenarios = load_har(args.har) if args.har else load_scenarios(args.payloads)
+    scenarios = [s for s in scenarios if s["requests"]]
+    if not scenarios:
+        sys.exit("No payloads to replay.")
+
+    client = Client(args.url, args.timeout)
+    print(f"⏳ Waiting for {args.url}{READY_PATH} ...")
+    wait_until_ready(client, timeout=300)
+    if not args.har:
+        if args.year is None:
+            args.year = busiest_year(client)
+        set_year_filter(scenarios, args.year)
+        print(f"📅 Year-filter scenarios use year {args.year}")
+
+    print(f"🚀 {args.users} users replaying {len(scenarios)} scenarios: "
+          f"{', '.join(s['name'] for s in scenarios)}")
+    recorder = Recorder()
+    t0 = time.perf_counter()
+    end = t0 + args.warmup + args.duration
+    threads = [
+        threading.Thread(target=simulate_user, name=f"user-{i}",
+                         args=(i, scenarios, client, recorder, args, t0, end))
+        for i in range(args.users)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Requests still in flight at the deadline finish late; measure to the real end
+    measured = max(time.perf_counter() - t0 - args.warmup, 1e-9)
+    results = summarize(recorder, args, scenarios, measured)
+    print_report(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
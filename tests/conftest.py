@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.utils.split_detection import SPLIT_COLUMNS, detect_split_contracts
+
+
+def synthetic_contracts(n: int = 5000, seed: int = 1) -> pd.DataFrame:
+    """merged_df-shaped frame with missing dates/methods and some split clusters."""
+    rng = np.random.default_rng(seed)
+    start = pd.Series(pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 1500, n), unit="D"))
+    start[rng.random(n) < 0.02] = pd.NaT
+    # A share of the values sit just below a procurement threshold
+    values = np.round(rng.lognormal(12, 2, n), 2)
+    near = rng.random(n) < 0.2
+    values[near] = np.round(rng.choice([500_000, 1_000_000], near.sum()) * rng.uniform(0.9, 1.0, near.sum()), 2)
+    df = pd.DataFrame({
+        "buyer_name": rng.choice(["Ministry A", "County B", "Agency C", "Board D"], n),
+        "supplier_id": rng.choice(["s1", "s2", "s3"], n),
+        "identifier_legalname": rng.choice(["Acme Ltd", "Beta Co", "Gamma Works"], n),
+        "title": rng.choice(["Road works", "Office supplies", "ICT equipment"], n),
+        "total_value_kes": values,
+        "contract_duration_days": rng.integers(1, 500, n),
+        "year": start.dt.year.fillna(2019).astype(int),
+        "contract_start_date": start,
+        "contract_end_date": start + pd.Timedelta(days=30),
+        "tender_procurementmethod": rng.choice(["Open", "Direct", None], n),
+        "cluster": rng.integers(0, 5, n),
+        "is_anomaly": rng.random(n) < 0.1,
+    })
+    df["supplier_name"] = df["supplier_id"].str.upper()
+    df[SPLIT_COLUMNS] = detect_split_contracts(df, supplier_col="supplier_id")
+    return df
+
+
+@pytest.fixture(scope="session")
+def contracts():
+    return synthetic_contracts()
@@ -0,0 +1,128 @@
+"""The pandas and DuckDB backends must answer every query the same way."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.backends.base import Filters, NO_FILTERS
+from dashboard.backends.pandas_backend import PandasBackend
+from dashboard.utils.table_filter import parse_filter_query
+from dashboard.utils.time_index import build_date_index, build_rollups
+
+duckdb_backend = pytest.importorskip("dashboard.backends.duckdb_backend")
+
+FILTERS = [
+    NO_FILTERS,
+    Filters(buyer="Ministry A"),
+    Filters(year=2020),
+    Filters(start_date="2020-03-15", end_date="2020-09-30"),
+    Filters("County B", 2021, "2021-02-01", None, "s2"),
+]
+COLUMN_FILTERS = [
+    '{buyer_name} = "Ministry A"',
+    "{title} icontains road",
+    "{total_value_kes} > 1000000 && {year} != 2020",
+    '{contract_start_date} datestartswith "2020-03"',
+    '{contract_start_date} >= "2021-01-01"',
+    "{tender_procurementmethod} is blank",
+    '{total_value_kes} contains "5.5"',
+    "{is_split_suspect} = 1",
+    "{no_such_column} = 1",
+]
+
+
+@pytest.fixture(scope="module")
+def backends(contracts, tmp_path_factory):
+    cache = tmp_path_factory.mktemp("cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(duckdb_backend, "PARQUET_CACHE_DIR", str(cache))
+        path = str(cache / "merged.parquet")
+        duckdb_backend.write_parquet(contracts, path)
+        duck = duckdb_backend.DuckDBBackend(path, "test")
+        pandas = PandasBackend(contracts, "test", build_date_index(contracts), build_rollups(contracts))
+        yield pandas, duck
+
+
+def assert_same(a: pd.DataFrame, b: pd.DataFrame):
+    pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True),
+                                  check_dtype=False, check_exact=False)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_aggregates_match(backends, filters):
+    pandas, duck = backends
+    assert pandas.count(filters) == duck.count(filters)
+    assert_same(pandas.value_by_year(filters), duck.value_by_year(filters))
+    assert_same(pandas.top_buyers(filters, 3), duck.top_buyers(filters, 3))
+    # Supplier names are any_value() in SQL; ids and totals must agree
+    assert_same(pandas.top_suppliers(filters, 3).drop(columns="supplier_name"),
+                duck.top_suppliers(filters, 3).drop(columns="supplier_name"))
+    assert_same(pandas.procurement_method_counts(filters), duck.procurement_method_counts(filters))
+    assert_same(pandas.anomalies_by_cluster(filters), duck.anomalies_by_cluster(filters))
+    assert_same(pandas.cluster_distribution(filters).sort_values("cluster"),
+                duck.cluster_distribution(filters).sort_values("cluster"))
+    for freq in ("M", "Q"):
+        assert_same(pandas.rollup(freq, filters), duck.rollup(freq, filters))
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_split_contracts_match(backends, filters):
+    pandas, duck = backends
+    columns = ["split_cluster_id", "buyer_name", "total_value_kes"]
+    summary_p, rows_p = pandas.split_contracts(filters, 50, columns)
+    summary_d, rows_d = duck.split_contracts(filters, 50, columns)
+    assert summary_p["clusters"] == summary_d["clusters"]
+    assert summary_p["contracts"] == summary_d["contracts"]
+    assert summary_p["total_value_kes"] == pytest.approx(summary_d["total_value_kes"])
+    assert list(rows_p.columns) == list(rows_d.columns) == columns
+    assert list(rows_p["split_cluster_id"]) == list(rows_d["split_cluster_id"])
+
+
+def reference_digit_counts(values):
+    counts = np.zeros(9, dtype=int)
+    for value in values.dropna():
+        digits = "".join(ch for ch in str(value) if ch.isdigit()).lstrip("0")
+        if digits:
+            counts[int(digits[0]) - 1] += 1
+    return counts
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_leading_digits_match(backends, filters):
+    pandas, duck = backends
+    expected = reference_digit_counts(pandas.filtered(filters)["total_value_kes"])
+    assert (duck.leading_digit_counts("total_value_kes", filters) == expected).all()
+    # The pandas path lives next to the plotting code (matplotlib, scipy)
+    pytest.importorskip("dashboard.utils.benford_utils")
+    assert (pandas.leading_digit_counts("total_value_kes", filters) == expected).all()
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_rows_match(backends, filters):
+    pandas, duck = backends
+    order = [("total_value_kes", False)]
+    assert_same(pandas.rows(filters, ["buyer_name", "total_value_kes"], 10, 5, order),
+                duck.rows(filters, ["buyer_name", "total_value_kes"], 10, 5, order))
+    assert len(duck.sample_rows(filters, ["total_value_kes"], 100)) == min(100, pandas.count(filters))
+
+
+@pytest.mark.parametrize("query", COLUMN_FILTERS)
+@pytest.mark.parametrize("filters", [NO_FILTERS, Filters(buyer="Ministry A")])
+def test_column_filters_match(backends, filters, query):
+    pandas, duck = backends
+    conditions = parse_filter_query(query)
+    count = pandas.count(filters, conditions)
+    assert count == duck.count(filters, conditions)
+    order = [("total_value_kes", True), ("title", True)]
+    rows_p = pandas.rows(filters, ["total_value_kes"], 0, 100, order, column_filters=conditions)
+    rows_d = duck.rows(filters, ["total_value_kes"], 0, 100, order, column_filters=conditions)
+    assert len(rows_p) == min(100, count)
+    np.testing.assert_allclose(rows_p["total_value_kes"], rows_d["total_value_kes"])
+
+
+def test_metadata_matches(backends):
+    pandas, duck = backends
+    assert pandas.summary() == pytest.approx(duck.summary())
+    assert pandas.date_bounds() == duck.date_bounds()
+    assert [int(y) for y in pandas.distinct("year")] == duck.distinct("year")
+    assert pandas.numeric_columns() == duck.numeric_columns()
+    assert_same(pandas.supplier_options(30), duck.supplier_options(30))
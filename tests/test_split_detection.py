@@ -0,0 +1,87 @@
+"""detect_split_contracts against a direct, pairwise reading of its definition."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.utils.split_detection import SPLIT_THRESHOLDS_KES, detect_split_contracts
+
+
+def brute_force_clusters(df, thresholds=SPLIT_THRESHOLDS_KES, below_pct=0.10, window_days=30,
+                         min_contracts=2, supplier_col="identifier_legalname"):
+    """
+    {row label: threshold} for flagged rows, and the clusters as sets of labels.
+    A row is flagged when some window of `window_days` holding it also holds
+    `min_contracts` just-below contracts of its (buyer, supplier, threshold);
+    flagged rows of a group chain into one cluster while gaps stay within the window.
+    """
+    candidates = {}
+    for label, row in df.iterrows():
+        value, date = row["total_value_kes"], row["contract_start_date"]
+        if pd.isna(value) or pd.isna(date) or pd.isna(row["buyer_name"]) or pd.isna(row[supplier_col]):
+            continue
+        limit = min((t for t in thresholds if t > value), default=None)
+        if limit is not None and limit * (1 - below_pct) <= value:
+            candidates[label] = ((row["buyer_name"], row[supplier_col], limit), date.normalize())
+
+    flagged = {}
+    for label, (group, day) in candidates.items():
+        for _, (other_group, end) in candidates.items():
+            if other_group != group or not end - pd.Timedelta(days=window_days) <= day <= end:
+                continue
+            in_window = sum(1 for g, d in candidates.values()
+                            if g == group and end - pd.Timedelta(days=window_days) <= d <= end)
+            if in_window >= min_contracts:
+                flagged[label] = group[2]
+                break
+
+    clusters = []
+    by_group = {}
+    for label in flagged:
+        by_group.setdefault(candidates[label][0], []).append(label)
+    for labels in by_group.values():
+        labels.sort(key=lambda l: candidates[l][1])
+        current = [labels[0]]
+        for prev, label in zip(labels, labels[1:]):
+            if candidates[label][1] - candidates[prev][1] <= pd.Timedelta(days=window_days):
+                current.append(label)
+            else:
+                clusters.append(frozenset(current))
+                current = [label]
+        clusters.append(frozenset(current))
+    return flagged, set(clusters)
+
+
+def random_contracts(seed, n=300):
+    rng = np.random.default_rng(seed)
+    limits = rng.choice(SPLIT_THRESHOLDS_KES[:3], n)
+    df = pd.DataFrame({
+        "buyer_name": rng.choice(["A", "B", None], n, p=[0.45, 0.45, 0.1]),
+        "identifier_legalname": rng.choice(["X", "Y"], n),
+        "total_value_kes": np.round(limits * rng.uniform(0.85, 1.02, n), 2),
+        "contract_start_date": pd.Timestamp("2021-01-01")
+        + pd.to_timedelta(rng.integers(0, 400, n), unit="D"),
+    }, index=rng.permutation(n) + 1000)
+    df.loc[df.sample(frac=0.05, random_state=seed).index, "contract_start_date"] = pd.NaT
+    df.loc[df.sample(frac=0.05, random_state=seed + 1).index, "total_value_kes"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("window_days,min_contracts", [(30, 2), (10, 3), (0, 2)])
+def test_matches_brute_force(seed, window_days, min_contracts):
+    df = random_contracts(seed)
+    result = detect_split_contracts(df, window_days=window_days, min_contracts=min_contracts)
+    flagged, clusters = brute_force_clusters(df, window_days=window_days, min_contracts=min_contracts)
+
+    assert result.index.equals(df.index)
+    suspects = result[result["is_split_suspect"]]
+    assert set(suspects.index) == set(flagged)
+    assert all(suspects["split_threshold_kes"] == pd.Series(flagged)[suspects.index])
+    found = {frozenset(rows.index) for _, rows in suspects.groupby("split_cluster_id")}
+    assert found == clusters
+    assert (result.loc[~result["is_split_suspect"], "split_cluster_id"] == -1).all()
+
+
+def test_missing_columns_flag_nothing():
+    df = random_contracts(0).drop(columns="identifier_legalname")
+    assert not detect_split_contracts(df)["is_split_suspect"].any()
@@ -0,0 +1,34 @@
+"""slice_rollup must equal rolling up the date-filtered rows from scratch."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.utils.aggregates import filter_contracts
+from dashboard.utils.time_index import build_date_index, build_rollups, rollup_by_period, slice_rollup
+
+
+def random_ranges(seed, count=40):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2018-10-01", "2023-04-30")
+    for _ in range(count):
+        start, end = sorted(rng.choice(days, 2))
+        start = None if rng.random() < 0.15 else pd.Timestamp(start).strftime("%Y-%m-%d")
+        end = None if rng.random() < 0.15 else pd.Timestamp(end).strftime("%Y-%m-%d")
+        yield start, end
+
+
+@pytest.mark.parametrize("freq", ["M", "Q"])
+def test_slice_rollup_matches_filtered_rollup(contracts, freq):
+    date_index = build_date_index(contracts)
+    rollup = build_rollups(contracts)[freq]
+    ranges = list(random_ranges(0)) + [
+        ("2020-01-01", "2020-12-31"),  # whole periods only
+        ("2020-02-10", "2020-02-20"),  # inside one period
+        ("2020-03-31", "2020-04-01"),  # straddles a boundary
+    ]
+    for start, end in ranges:
+        expected = rollup_by_period(
+            filter_contracts(contracts, start_date=start, end_date=end), freq)
+        got = slice_rollup(rollup, freq, start, end, df=contracts, date_index=date_index)
+        pd.testing.assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True),
+                                      check_dtype=False, obj=f"{freq} {start}..{end}")